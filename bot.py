@@ -2,11 +2,14 @@ import os
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
-from utils import db
+from utils import async_db, db
+from utils.warhorn_api import AsyncWarhornClient, WARHORN_API_ENDPOINT
+from utils.warhorn_snapshots import WarhornSnapshotService
 
 load_dotenv()
 
 discord_token = os.getenv("DISCORD_TOKEN")
+WARHORN_SLUG = "pandodnd"
 
 description = '''
 A placeholder bot for the P4ND0 server, much more will eventually be here
@@ -20,12 +23,17 @@ intents.members = True
 class P4ND0Bot(commands.Bot):
     def __init__(self):
         super().__init__(command_prefix='$', description=description, intents=intents)
+        # Shared by the Warhorn, Sessions and Announcements cogs so they reuse one cached fetch.
+        self.warhorn_snapshots = WarhornSnapshotService(
+            AsyncWarhornClient(WARHORN_API_ENDPOINT, os.getenv("WARHORN_APPLICATION_TOKEN")),
+            WARHORN_SLUG,
+        )
 
     async def setup_hook(self):
         try:
-            db.init_schema()
-            db.migrate_from_json()
-            db.seed_warhorn_sessions_from_cache()
+            await async_db.init_schema()
+            await async_db.migrate_from_json()
+            await async_db.seed_warhorn_sessions_from_cache()
             print("Database ready.")
         except Exception as e:
             print(f"Database initialization failed: {e}")
@@ -46,6 +54,12 @@ class P4ND0Bot(commands.Bot):
         except Exception as e:
             print(f"Failed to sync slash commands: {e}")
 
+    async def close(self):
+        await super().close()
+        await self.warhorn_snapshots.close()
+        async_db.shutdown()
+        db.close_pool()
+
     async def on_ready(self):
         current_time = discord.utils.utcnow().strftime("%Y-%m-%d %H:%M:%S")
         print(f'[{current_time}] Logged in as {self.user} (ID: {self.user.id})')
@@ -1,16 +1,14 @@
-import os
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
 import discord
 from discord.ext import commands, tasks
 
-from utils import db
-from utils.warhorn_api import WarhornClient, parse_warhorn_dt
+from utils import async_db
+from utils.warhorn_api import parse_warhorn_dt
 
 EASTERN = ZoneInfo("America/New_York")
 WARHORN_SLUG = "pandodnd"
-WARHORN_API_ENDPOINT = "https://warhorn.net/graphql"
 DAN_TEXT_CHANNEL_ID = 701628514004238416
 ANNOUNCEMENT_WINDOW = timedelta(minutes=15)
 
@@ -29,7 +27,7 @@ ABILITIES_TEXT = (
 class Announcements(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.warhorn_client = WarhornClient(WARHORN_API_ENDPOINT, os.getenv("WARHORN_APPLICATION_TOKEN"))
+        self.warhorn_snapshots = bot.warhorn_snapshots
         self.check_announcements.start()
 
     def cog_unload(self):
@@ -43,9 +41,7 @@ class Announcements(commands.Cog):
         now = datetime.now(EASTERN)
 
         try:
-            result = self.warhorn_client.get_sessions_for_gotime(WARHORN_SLUG, now=now.astimezone(timezone.utc))
-            nodes = result.get("data", {}).get("eventSessions", {}).get("nodes", [])
-            db.record_warhorn_sessions(nodes)
+            nodes = (await self.warhorn_snapshots.get()).nodes
         except Exception as e:
             print(f"[Announcements] Failed to fetch Warhorn sessions: {e}")
             return
@@ -77,14 +73,14 @@ class Announcements(commands.Cog):
             return
 
         sentinel = today_session["id"]
-        if db.has_announcement_fired(sentinel, "day_of_noon"):
+        if await async_db.has_announcement_fired(sentinel, "day_of_noon"):
             return
 
         embed = self._session_embed(today_session, title_prefix="Today's session")
         embed.add_field(name="​", value=ABILITIES_TEXT, inline=False)
         await channel.send(embed=embed)
 
-        db.mark_announcement_fired(sentinel, "day_of_noon")
+        await async_db.mark_announcement_fired(sentinel, "day_of_noon")
         print(f"[Announcements] Fired day_of_noon for {sentinel}")
 
     async def _check_session_reminders(self, now, channel, session):
@@ -101,9 +97,9 @@ class Announcements(commands.Cog):
 
         for ann_type, target, message in reminders:
             if target <= now < target + ANNOUNCEMENT_WINDOW:
-                if not db.has_announcement_fired(session_id, ann_type):
+                if not await async_db.has_announcement_fired(session_id, ann_type):
                     await channel.send(message)
-                    db.mark_announcement_fired(session_id, ann_type)
+                    await async_db.mark_announcement_fired(session_id, ann_type)
                     print(f"[Announcements] Fired {ann_type} for {session_id}")
 
     def _session_embed(self, session, title_prefix="Session"):
@@ -147,9 +143,7 @@ class Announcements(commands.Cog):
         now = datetime.now(EASTERN)
         today_session = None
         try:
-            result = self.warhorn_client.get_sessions_for_gotime(WARHORN_SLUG, now=now.astimezone(timezone.utc))
-            nodes = result.get("data", {}).get("eventSessions", {}).get("nodes", [])
-            db.record_warhorn_sessions(nodes)
+            nodes = (await self.warhorn_snapshots.get()).nodes
             today_session = next(
                 (s for s in nodes if parse_warhorn_dt(s["startsAt"]).astimezone(EASTERN).date() == now.date()),
                 None,
@@ -1,87 +1,106 @@
-import asyncio
-import re
-import requests
 import json
+import os
+import time
+import aiohttp
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 
-from utils import db
+from utils import async_db
+from utils.character_store import (
+    CHARACTER_CACHE_SIZE,
+    CHARACTER_CACHE_TTL_SECONDS,
+    CharacterRecord,
+    CharacterStore,
+    extract_character_id,
+)
+from utils.character_refresh import CHARACTER_REFRESH_BUDGET, CHARACTER_REFRESH_CONCURRENCY, refresh_characters
+from utils.ddb_client import DDBClient
 
-DDB_CHARACTER_ID_RE = re.compile(r"characters/(\d+)")
+# Plain substring test run before the regex; every DDB character link contains it.
+DDB_LINK_MARKER = "characters/"
+# A user pasting the same character link again within this window is ignored.
+LINK_DEBOUNCE_SECONDS = 300
 
 
 class Characters(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        timestamp = discord.utils.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        # Loaded per user on first use, so start-up doesn't read the whole characters table.
+        self.characters = CharacterStore(
+            async_db.load_user_characters,
+            max_users=int(os.getenv("CHARACTER_CACHE_SIZE", CHARACTER_CACHE_SIZE)),
+            ttl=float(os.getenv("CHARACTER_CACHE_TTL", CHARACTER_CACHE_TTL_SECONDS)),
+        )
+        self.ddb = DDBClient()
+        self._recent_links: dict[tuple[int, str], float] = {}
+        self.link_stats = {"scanned": 0, "matched": 0, "debounced": 0}
+        self.refresh_budget = int(os.getenv("CHARACTER_REFRESH_BUDGET", CHARACTER_REFRESH_BUDGET))
+
+    async def cog_load(self):
+        self.refresh_saved_characters.start()
+
+    async def cog_unload(self):
+        self.refresh_saved_characters.cancel()
+        await self.ddb.close()
+
+    @tasks.loop(hours=24)
+    async def refresh_saved_characters(self):
+        """Keep stored names and avatars current, a budgeted slice of the table per day."""
+        try:
+            rows = await async_db.load_characters_to_refresh(self.refresh_budget)
+            result = await refresh_characters(self.ddb, rows, CHARACTER_REFRESH_CONCURRENCY)
+            await async_db.save_character_refreshes(result.updates, result.checked)
+        except Exception as e:
+            print(f"[Characters] Error refreshing saved characters: {e}")
+            return
+
+        for row in result.updates:
+            character_id = extract_character_id(row["url"])
+            if character_id:
+                self.characters.refresh(character_id, row["name"], row["avatar_url"])
+        print(
+            f"[Characters] Refreshed {len(rows)} saved characters: {result.refreshed} refreshed, "
+            f"{result.unchanged} unchanged, {result.failed} failed."
+        )
 
-        self.characters = db.load_all_characters()
-        if self.characters:
-            print(f"[{timestamp}] Characters loaded from database.")
+    @refresh_saved_characters.before_loop
+    async def before_refresh_saved_characters(self):
+        await self.bot.wait_until_ready()
 
     char_group = app_commands.Group(name="character", description="Manage your D&D Beyond characters")
 
     @staticmethod
     def _extract_character_id(text: str) -> str | None:
-        match = DDB_CHARACTER_ID_RE.search(text)
-        return match.group(1) if match else None
+        return extract_character_id(text)
 
     @staticmethod
     def _clean_character_url(character_id: str) -> str:
         return f"https://www.dndbeyond.com/characters/{character_id}"
 
-    @staticmethod
-    def _character_urls_match(url1: str, url2: str) -> bool:
-        id1 = Characters._extract_character_id(url1)
-        id2 = Characters._extract_character_id(url2)
-        return id1 is not None and id1 == id2
-
-    async def _fetch_character_from_ddb(self, character_id: str) -> tuple[str, str | None]:
-        json_api_url = f"https://character-service.dndbeyond.com/character/v5/character/{character_id}"
-        print(f"Fetching character data from: {json_api_url}")
-        response = await asyncio.to_thread(requests.get, json_api_url, timeout=10)
-        response.raise_for_status()
-        char_data = response.json()
-
-        if not char_data or "data" not in char_data:
-            raise ValueError("missing_data")
-
-        char_info = char_data["data"]
-        character_name = char_info.get("name", "Unknown Character")
-        if not character_name and char_info.get("username"):
-            character_name = char_info.get("username")
-
-        avatar_url = char_info.get("decorations", {}).get("avatarUrl")
-        return character_name, avatar_url
-
-    def _upsert_user_character(
+    async def _fetch_character_from_ddb(self, character_id: str, *, refresh: bool = False) -> tuple[str, str | None]:
+        character = await self.ddb.get_character(character_id, refresh=refresh)
+        return character.name, character.avatar_url
+
+    async def _upsert_user_character(
         self, user_id: int, clean_url: str, character_name: str, avatar_url: str | None
     ) -> bool:
-        user_characters = self.characters.setdefault(user_id, [])
-        found = False
-        for i, char_entry in enumerate(user_characters):
-            if self._character_urls_match(char_entry["url"], clean_url):
-                user_characters[i] = {"url": clean_url, "name": character_name, "avatar_url": avatar_url}
-                found = True
-                break
-        if not found:
-            user_characters.append({"url": clean_url, "name": character_name, "avatar_url": avatar_url})
-
-        db.save_character(user_id, clean_url, character_name, avatar_url)
-        return not found
+        was_new = await self.characters.upsert(user_id, CharacterRecord.from_url(clean_url, character_name, avatar_url))
+        await async_db.save_character(user_id, clean_url, character_name, avatar_url)
+        return was_new
 
     async def _handle_ddb_fetch_error(self, send, error: Exception):
-        if isinstance(error, requests.exceptions.HTTPError):
-            if error.response.status_code == 403:
+        if isinstance(error, aiohttp.ClientResponseError):
+            if error.status == 403:
                 await send(
                     "❌ Could not retrieve character data! D&D Beyond returned a `403 Forbidden` error.\n\n"
                     "**Fix:** The bot cannot read Private character sheets. Please go to your character's `Preferences` page on D&D Beyond and ensure **Character Privacy** is set to **Public**.",
                 )
             else:
-                await send(f"Could not fetch character data due to an HTTP error: {error}")
-            print(f"HTTPError fetching D&D Beyond character: {error}")
-        elif isinstance(error, requests.exceptions.RequestException):
+                await send(f"Could not fetch character data due to an HTTP error: {error.status} {error.message}")
+            # Not str(error): cached refusals carry no request_info for it to format.
+            print(f"HTTPError fetching D&D Beyond character: {error.status} {error.message}")
+        elif isinstance(error, (aiohttp.ClientError, TimeoutError)):
             await send(f"Could not fetch character data due to a network error: {error}")
             print(f"Network error fetching D&D Beyond character: {error}")
         elif isinstance(error, json.JSONDecodeError):
@@ -128,8 +147,9 @@ class Characters(commands.Cog):
         clean_url = self._clean_character_url(character_id)
 
         try:
-            character_name, avatar_url = await self._fetch_character_from_ddb(character_id)
-            was_new = self._upsert_user_character(target.id, clean_url, character_name, avatar_url)
+            # An explicit add skips a cached 403 so a sheet just made public works straight away.
+            character_name, avatar_url = await self._fetch_character_from_ddb(character_id, refresh=True)
+            was_new = await self._upsert_user_character(target.id, clean_url, character_name, avatar_url)
 
             if added_by_other:
                 title = f"{target.display_name} — {'Character Added' if was_new else 'Character Updated'}: {character_name}"
@@ -155,17 +175,25 @@ class Characters(commands.Cog):
         if message.author.bot or not message.content:
             return
 
+        self.link_stats["scanned"] += 1
+        if DDB_LINK_MARKER not in message.content:
+            return
         character_id = self._extract_character_id(message.content)
         if not character_id:
             return
+        self.link_stats["matched"] += 1
 
-        clean_url = self._clean_character_url(character_id)
         user_id = message.author.id
+        if self._debounce_link(user_id, character_id):
+            self.link_stats["debounced"] += 1
+            return
+
+        clean_url = self._clean_character_url(character_id)
 
         try:
             character_name, avatar_url = await self._fetch_character_from_ddb(character_id)
-            was_new = self._upsert_user_character(user_id, clean_url, character_name, avatar_url)
-            db.set_character_selection(user_id, clean_url, character_name)
+            was_new = await self._upsert_user_character(user_id, clean_url, character_name, avatar_url)
+            await async_db.set_character_selection(user_id, clean_url, character_name)
 
             if was_new:
                 title = f"Character added and set for next session: {character_name}"
@@ -178,14 +206,36 @@ class Characters(commands.Cog):
             embed.set_footer(text=f"Detected from {message.author.display_name}'s message")
 
             await message.reply(embed=embed, mention_author=False)
-            print(f"Auto-detected character for user {user_id}: {character_name} ({clean_url})")
+            print(
+                f"Auto-detected character for user {user_id}: {character_name} ({clean_url}) "
+                f"[scanned {self.link_stats['scanned']}, matched {self.link_stats['matched']}, "
+                f"debounced {self.link_stats['debounced']}]"
+            )
         except Exception as e:
+            # Let the user post the link again straight away once they've fixed the sheet.
+            self._recent_links.pop((user_id, character_id), None)
             await self._handle_ddb_fetch_error(
                 lambda msg: message.reply(msg, mention_author=False), e
             )
 
-    def _build_character_list_embed(self, target: discord.Member, user_characters: list[dict]) -> discord.Embed:
-        selection = db.get_character_selection(target.id)
+    def _debounce_link(self, user_id: int, character_id: str) -> bool:
+        """True if this user already posted this character's link within the debounce window."""
+        now = time.monotonic()
+        key = (user_id, character_id)
+        last = self._recent_links.get(key)
+        if last is not None and now - last < LINK_DEBOUNCE_SECONDS:
+            return True
+        if len(self._recent_links) > 1000:
+            self._recent_links = {
+                k: seen for k, seen in self._recent_links.items() if now - seen < LINK_DEBOUNCE_SECONDS
+            }
+        self._recent_links[key] = now
+        return False
+
+    async def _build_character_list_embed(
+        self, target: discord.Member, user_characters: list[CharacterRecord]
+    ) -> discord.Embed:
+        selection = (await async_db.get_character_selections([target.id])).get(target.id)
 
         embed = discord.Embed(
             title=f"{target.display_name}'s D&D Beyond Characters",
@@ -208,14 +258,11 @@ class Characters(commands.Cog):
                 inline=False,
             )
         else:
+            selected_id = extract_character_id(selection["character_url"]) if selection else None
             lines = []
-            for i, char_entry in enumerate(user_characters):
-                char_name = char_entry.get("name", "Unknown Character")
-                char_url = char_entry.get("url", "#")
-                marker = ""
-                if selection and self._character_urls_match(char_entry["url"], selection["character_url"]):
-                    marker = " ▶ "
-                lines.append(f"{i + 1}.{marker} [{char_name}]({char_url})")
+            for i, record in enumerate(user_characters):
+                marker = " ▶ " if selected_id is not None and record.character_id == selected_id else ""
+                lines.append(f"{i + 1}.{marker} [{record.name or 'Unknown Character'}]({record.url or '#'})")
             embed.add_field(name="Saved characters", value="\n".join(lines), inline=False)
 
         embed.set_footer(text="Use /character play to set a character for the next session.")
@@ -233,9 +280,9 @@ class Characters(commands.Cog):
                 return
 
         target = player or interaction.user
-        user_characters = self.characters.get(target.id, [])
+        user_characters = await self.characters.characters(target.id)
 
-        embed = self._build_character_list_embed(target, user_characters)
+        embed = await self._build_character_list_embed(target, user_characters)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     def _target_user_id(self, interaction: discord.Interaction, player: discord.Member | None) -> int:
@@ -244,12 +291,10 @@ class Characters(commands.Cog):
     async def play_autocomplete(self, interaction: discord.Interaction, current: str):
         player = interaction.namespace.player
         user_id = player.id if player else interaction.user.id
-        user_characters = self.characters.get(user_id, [])
         return [
-            app_commands.Choice(name=f"{i + 1}. {char['name']}", value=str(i + 1))
-            for i, char in enumerate(user_characters)
-            if current.lower() in char["name"].lower()
-        ][:25]
+            app_commands.Choice(name=f"{number}. {record.name}"[:100], value=str(number))
+            for number, record in await self.characters.search(user_id, current)
+        ]
 
     def _send_play_embed(
         self,
@@ -320,9 +365,9 @@ class Characters(commands.Cog):
             clean_url = self._clean_character_url(character_id)
 
             try:
-                character_name, avatar_url = await self._fetch_character_from_ddb(character_id)
-                self._upsert_user_character(target.id, clean_url, character_name, avatar_url)
-                db.set_character_selection(target.id, clean_url, character_name)
+                character_name, avatar_url = await self._fetch_character_from_ddb(character_id, refresh=True)
+                await self._upsert_user_character(target.id, clean_url, character_name, avatar_url)
+                await async_db.set_character_selection(target.id, clean_url, character_name)
 
                 embed = self._send_play_embed(
                     interaction,
@@ -340,7 +385,7 @@ class Characters(commands.Cog):
                 )
             return
 
-        user_characters = self.characters.get(target.id, [])
+        user_characters = await self.characters.characters(target.id)
 
         try:
             idx = int(character) - 1
@@ -356,15 +401,15 @@ class Characters(commands.Cog):
             await interaction.response.send_message(hint, ephemeral=True)
             return
 
-        char = user_characters[idx]
-        db.set_character_selection(target.id, char["url"], char["name"])
+        record = user_characters[idx]
+        await async_db.set_character_selection(target.id, record.url, record.name)
 
         embed = self._send_play_embed(
             interaction,
             target,
-            char["name"],
-            char["url"],
-            char.get("avatar_url"),
+            record.name,
+            record.url,
+            record.avatar_url,
             assigned_by_other=assigned_by_other,
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
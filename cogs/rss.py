@@ -1,130 +1,406 @@
-import re
 import asyncio
-from datetime import datetime, timezone
+import heapq
+import time
+from datetime import datetime, timedelta, timezone
 
 import discord
 from discord.ext import commands, tasks
-import feedparser
 
-from utils import db
-
-POLL_INTERVAL_MINUTES = 60
-MAX_SEEN_PER_FEED = 500
+from utils import async_db, feed_fetch
+from utils.db import entry_hash, is_entry_seen
+from utils.feed_fetch import FeedEntry, FeedResult
+from utils.feed_schedule import (
+    CatchUpPlan,
+    CatchUpPolicy,
+    cache_lifetime,
+    compute_poll_interval,
+    plan_catch_up,
+    publish_cadence,
+    spread_overdue,
+    with_jitter,
+)
+
+SCHEDULER_TICK_MINUTES = 1
+# Feeds that came due while the bot was down are spread over this window on start-up.
+STARTUP_SPREAD = timedelta(minutes=10)
+# rss_seen retention, applied to every feed by one background prune a day.
+SEEN_PRUNE_INTERVAL = timedelta(days=1)
+SEEN_MAX_AGE_DAYS = 365
+SEEN_MAX_PER_FEED = 500
+SEEN_MIN_PER_FEED = 100
+# Cross-feed duplicates turn up within days of each other, so fingerprints needn't live long.
+FINGERPRINT_MAX_AGE_DAYS = 30
+# Downloads in flight at once; parsing is queued separately on feed_fetch's worker pool.
+FETCH_CONCURRENCY = 8
+# Discord's per-message limits: at most 10 embeds, 6000 characters across all of them.
+EMBEDS_PER_MESSAGE = 10
+EMBED_CHARS_PER_MESSAGE = 6000
+DIGEST_DESCRIPTION_LIMIT = 4000
+
+
+def pack_embeds(embeds: list, max_per_message: int = EMBEDS_PER_MESSAGE,
+                max_chars: int = EMBED_CHARS_PER_MESSAGE) -> list[list]:
+    """Group embeds, in order, into as few messages as Discord's limits allow."""
+    batches: list[list] = []
+    current: list = []
+    current_chars = 0
+    for embed in embeds:
+        size = len(embed)
+        if current and (len(current) >= max_per_message or current_chars + size > max_chars):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(embed)
+        current_chars += size
+    if current:
+        batches.append(current)
+    return batches
 
 
 class RSSFeed(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._feeds: dict[str, dict] = {}
+        # (due unix time, feed url). Entries that no longer match _next_due (feed removed or
+        # rescheduled) are skipped when popped instead of being searched for and deleted.
+        self._due: list[tuple[float, str]] = []
+        self._next_due: dict[str, float] = {}
+        # Seen entry hashes per feed, loaded from rss_seen once and kept in step with every write.
+        self._seen: dict[str, set[str]] | None = None
+        self._seen_pruned_at: datetime | None = None
+        # Content fingerprints already posted per channel, shared by every feed posting there.
+        self._fingerprints: dict[int, set[str]] | None = None
+        # Unseen entries held back by the catch-up policy, oldest first, with the fetch they came from.
+        self._backlog: dict[str, tuple[list[FeedEntry], FeedResult]] = {}
         self.poll_feeds.start()
 
-    def cog_unload(self):
+    async def cog_unload(self):
         self.poll_feeds.cancel()
+        await feed_fetch.shutdown()
 
-    def _entry_id(self, entry) -> str:
-        return entry.get("id") or entry.get("link") or entry.get("title", "")
-
-    def _strip_html(self, text: str) -> str:
-        return re.sub(r"<[^>]+>", "", text).strip()
-
-    def _make_embed(self, entry, feed_name: str) -> discord.Embed:
-        title = (entry.get("title") or "No title")[:256]
-        link = entry.get("link", "")
+    def _make_embed(self, entry: FeedEntry, feed_name: str) -> discord.Embed:
+        embed = discord.Embed(
+            title=(entry.title or "No title")[:256],
+            color=discord.Color.orange(),
+            timestamp=entry.timestamp,
+        )
+        if entry.link:
+            embed.url = entry.link
+        if entry.summary:
+            embed.description = entry.summary
+        embed.set_footer(text=feed_name)
 
-        summary = ""
-        raw = entry.get("summary") or ""
-        if raw:
-            summary = self._strip_html(raw)
-            if len(summary) > 300:
-                summary = summary[:297] + "..."
+        return embed
 
-        published = entry.get("published_parsed") or entry.get("updated_parsed")
-        timestamp = None
-        if published:
-            timestamp = datetime(*published[:6], tzinfo=timezone.utc)
+    def _make_digest_embed(self, entries: list[FeedEntry], feed_name: str) -> discord.Embed:
+        lines = []
+        used = 0
+        for index, entry in enumerate(entries):
+            title = (entry.title or "No title")[:200]
+            line = f"• [{title}]({entry.link})" if entry.link else f"• {title}"
+            remaining = len(entries) - index
+            if used + len(line) + 1 > DIGEST_DESCRIPTION_LIMIT - 40:
+                lines.append(f"…and {remaining} more.")
+                break
+            lines.append(line)
+            used += len(line) + 1
 
         embed = discord.Embed(
-            title=title,
+            title=f"{feed_name}: {len(entries)} new posts"[:256],
+            description="\n".join(lines),
             color=discord.Color.orange(),
-            timestamp=timestamp,
+            timestamp=entries[-1].timestamp,
         )
-        if link:
-            embed.url = link
-        if summary:
-            embed.description = summary
         embed.set_footer(text=feed_name)
-
         return embed
 
-    @tasks.loop(minutes=POLL_INTERVAL_MINUTES)
+    async def _deliver(self, channel, entries: list[FeedEntry], feed_config: dict) -> list[FeedEntry]:
+        """Post entries oldest first, as one digest above the feed's threshold or as packed embeds.
+
+        Returns the entries that made it, so only those are marked seen.
+        """
+        feed_name = feed_config.get("name", feed_config.get("url"))
+        threshold = feed_config.get("digest_threshold")
+        if threshold and len(entries) > threshold:
+            try:
+                await channel.send(embed=self._make_digest_embed(entries, feed_name))
+                return entries
+            except Exception as e:
+                print(f"[RSS] Error posting digest to {channel.id}: {e}")
+                return []
+
+        delivered = []
+        start = 0
+        for batch in pack_embeds([self._make_embed(entry, feed_name) for entry in entries]):
+            try:
+                await channel.send(embeds=batch)
+                delivered.extend(entries[start:start + len(batch)])
+            except Exception as e:
+                print(f"[RSS] Error posting {len(batch)} entry/entries to {channel.id}: {e}")
+            start += len(batch)
+        return delivered
+
+    @tasks.loop(minutes=SCHEDULER_TICK_MINUTES)
     async def poll_feeds(self):
         if not self.bot.is_ready():
             return
 
-        feeds = db.load_all_feeds()
-        if not feeds:
+        now = datetime.now(timezone.utc)
+        if self._seen_pruned_at is None or now - self._seen_pruned_at >= SEEN_PRUNE_INTERVAL:
+            await self._prune_seen(now)
+        if self._seen is None:
+            self._seen = await async_db.load_all_seen_hashes()
+            self._fingerprints = await async_db.load_all_fingerprints()
+
+        feeds = await async_db.load_all_feeds()
+        self._sync_schedule(feeds, now)
+
+        due = []
+        while self._due and self._due[0][0] <= now.timestamp():
+            due_at, url = heapq.heappop(self._due)
+            if url in self._feeds and self._next_due.get(url) == due_at:
+                del self._next_due[url]
+                due.append(self._feeds[url])
+
+        if due:
+            ts = discord.utils.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"[{ts}] [RSS] Polling {len(due)}/{len(self._feeds)} due feed(s)...")
+
+            semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+            started = time.perf_counter()
+            await asyncio.gather(*(self._poll_and_reschedule(feed_config, semaphore) for feed_config in due))
+            print(f"[RSS] Poll cycle finished in {(time.perf_counter() - started) * 1000:.0f}ms.")
+
+        # Feeds just polled have already posted this cycle's share.
+        await self._drain_backlogs({feed_config["url"] for feed_config in due})
+
+    async def _prune_seen(self, now: datetime):
+        """Apply seen-entry retention, then reload the in-memory sets to match.
+
+        Runs inside the poll tick rather than its own loop so no poll can add a hash
+        between the reload's SELECT and the sets being replaced.
+        """
+        self._seen_pruned_at = now
+        try:
+            deleted = await async_db.prune_seen_entries(SEEN_MAX_AGE_DAYS, SEEN_MAX_PER_FEED, SEEN_MIN_PER_FEED)
+            deleted_fingerprints = await async_db.prune_fingerprints(FINGERPRINT_MAX_AGE_DAYS)
+        except Exception as e:
+            print(f"[RSS] Error pruning seen entries: {e}")
             return
-
-        ts = discord.utils.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{ts}] [RSS] Polling {len(feeds)} feed(s)...")
-
-        loop = asyncio.get_event_loop()
-
-        for feed_config in feeds:
-            url = feed_config.get("url")
-            channel_id = feed_config.get("channel_id")
-            feed_name = feed_config.get("name", url)
-
-            if not url or not channel_id:
-                print(f"[RSS] Skipping invalid feed config: {feed_config}")
+        print(f"[RSS] Pruned {deleted} seen entry row(s) and {deleted_fingerprints} fingerprint(s).")
+        self._seen = None
+
+    def _sync_schedule(self, feeds: list, now: datetime):
+        """Queue feeds we haven't scheduled yet, honouring their persisted next poll time."""
+        current = {feed["url"]: feed for feed in feeds if feed.get("url")}
+        overdue = []
+        for url, feed in current.items():
+            if url in self._feeds:
                 continue
-
-            try:
-                parsed = await loop.run_in_executor(None, feedparser.parse, url)
-
-                if parsed.bozo and not parsed.entries:
-                    print(f"[RSS] Failed to parse {feed_name}: {parsed.bozo_exception}")
-                    continue
-
-                entries = parsed.entries
-                seen_ids = db.get_seen_ids(url)
-                is_first_run = len(seen_ids) == 0
-
-                current_ids = {self._entry_id(e) for e in entries}
-                new_entries = [e for e in entries if self._entry_id(e) not in seen_ids]
-
-                if is_first_run:
-                    db.add_seen_ids(url, current_ids)
-                    print(f"[RSS] First run for {feed_name}: marked {len(current_ids)} existing entries as seen.")
-                    continue
-
-                if not new_entries:
-                    print(f"[RSS] No new entries for {feed_name}.")
-                    continue
-
-                channel = self.bot.get_channel(channel_id)
-                if not channel:
-                    try:
-                        channel = await self.bot.fetch_channel(channel_id)
-                    except Exception as e:
-                        print(f"[RSS] Could not find channel {channel_id}: {e}")
-                        continue
-
-                posted_ids = []
-                for entry in reversed(new_entries):
-                    try:
-                        embed = self._make_embed(entry, feed_name)
-                        await channel.send(embed=embed)
-                        posted_ids.append(self._entry_id(entry))
-                    except Exception as e:
-                        print(f"[RSS] Error posting entry to {channel_id}: {e}")
-
-                if posted_ids:
-                    db.add_seen_ids(url, posted_ids)
-                    db.prune_seen(url, MAX_SEEN_PER_FEED)
-                print(f"[RSS] Posted {len(posted_ids)}/{len(new_entries)} new entry/entries for {feed_name}.")
-
-            except Exception as e:
-                print(f"[RSS] Unexpected error for feed {url}: {e}")
+            next_poll_at = feed.get("next_poll_at")
+            if next_poll_at and next_poll_at > now:
+                self._schedule(url, next_poll_at)
+            else:
+                overdue.append(url)
+        for url, due_at in zip(overdue, spread_overdue(len(overdue), now, STARTUP_SPREAD)):
+            self._schedule(url, due_at)
+        for url in self._feeds.keys() - current.keys():
+            self._next_due.pop(url, None)
+        self._feeds = current
+
+    def _schedule(self, url: str, due_at: datetime):
+        self._next_due[url] = due_at.timestamp()
+        heapq.heappush(self._due, (due_at.timestamp(), url))
+
+    async def _poll_and_reschedule(self, feed_config: dict, semaphore: asyncio.Semaphore):
+        result = await self._poll_feed(feed_config, semaphore)
+        now = datetime.now(timezone.utc)
+        previous = feed_config.get("poll_interval_s")
+        previous = timedelta(seconds=previous) if previous else None
+
+        if result is None:
+            interval = compute_poll_interval(previous, changed=False)
+        else:
+            not_modified = result.status == 304
+            timestamps = [] if not_modified else [e.timestamp for e in result.entries if e.timestamp]
+            interval = compute_poll_interval(
+                previous,
+                cadence=publish_cadence(timestamps),
+                cache_for=cache_lifetime(result.headers, now),
+                changed=not not_modified,
+            )
+
+        next_poll_at = now + with_jitter(interval)
+        if feed_config["url"] in self._feeds:
+            self._schedule(feed_config["url"], next_poll_at)
+        try:
+            await async_db.save_feed_schedule(feed_config["url"], next_poll_at, int(interval.total_seconds()))
+        except Exception as e:
+            print(f"[RSS] Could not save poll schedule for {feed_config['url']}: {e}")
+        print(f"[RSS] Next poll of {feed_config.get('name', feed_config['url'])} in {interval.total_seconds() / 60:.0f} min.")
+
+    async def _fetch_feed(self, feed_config: dict, semaphore: asyncio.Semaphore) -> FeedResult:
+        """Fetch with the stored validators, so an unchanged feed costs a 304."""
+        async with semaphore:
+            return await feed_fetch.fetch(feed_config["url"], feed_config.get("etag"), feed_config.get("modified"))
+
+    async def _poll_feed(self, feed_config: dict, semaphore: asyncio.Semaphore):
+        """Fetch one feed and post anything new. Returns the fetch result, or None if the poll failed."""
+        url = feed_config.get("url")
+        channel_id = feed_config.get("channel_id")
+        feed_name = feed_config.get("name", url)
+
+        if not url or not channel_id:
+            print(f"[RSS] Skipping invalid feed config: {feed_config}")
+            return None
+
+        try:
+            result = await self._fetch_feed(feed_config, semaphore)
+
+            if result.status == 304:
+                print(f"[RSS] {feed_name} not modified.")
+                return result
+
+            if result.error:
+                print(f"[RSS] Failed to parse {feed_name}: {result.error}")
+                return None
+
+            seen = self._seen.get(url)
+            is_first_run = not seen
+            unseen = [e for e in reversed(result.entries) if not is_entry_seen(e.entry_id, seen or ())]
+
+            if not unseen:
+                self._backlog.pop(url, None)
+                await self._save_validators(feed_config, result)
+                print(f"[RSS] No new entries for {feed_name}.")
+                return result
+
+            now = datetime.now(timezone.utc)
+            # next_poll_at is when this poll was due; far behind it means the bot was down.
+            due_at = feed_config.get("next_poll_at")
+            plan = plan_catch_up(
+                unseen,
+                CatchUpPolicy.for_feed(feed_config),
+                now,
+                first_run=is_first_run,
+                digest_threshold=feed_config.get("digest_threshold"),
+                overdue=now - due_at if due_at else None,
+            )
+            if is_first_run:
+                print(f"[RSS] First run for {feed_name}: marking {len(plan.skip)} existing entries as seen.")
+            await self._post_plan(feed_config, plan, result)
+            return result
+
+        except TimeoutError:
+            print(f"[RSS] Timed out fetching {feed_name}.")
+            return None
+        except Exception as e:
+            print(f"[RSS] Unexpected error for feed {url}: {e}")
+            return None
+
+    async def _post_plan(self, feed_config: dict, plan: CatchUpPlan, result: FeedResult):
+        """Post this cycle's share of a feed's unseen entries and keep the rest as its backlog."""
+        url = feed_config["url"]
+        channel_id = feed_config["channel_id"]
+        feed_name = feed_config.get("name", url)
+
+        if plan.skip:
+            await self._mark_seen(url, [entry_hash(entry.entry_id) for entry in plan.skip])
+
+        delivered, duplicates, failed = [], [], 0
+        if plan.post:
+            channel = await self._resolve_channel(channel_id)
+            if channel is None:
+                return
+            to_post, duplicates = self._claim_fingerprints(channel_id, plan.post)
+            delivered = await self._deliver(channel, to_post, feed_config) if to_post else []
+            self._release_fingerprints(channel_id, [e for e in to_post if e not in delivered])
+            failed = len(to_post) - len(delivered)
+
+            posted_hashes = [entry_hash(entry.entry_id) for entry in delivered + duplicates]
+            if posted_hashes:
+                await self._mark_seen(url, posted_hashes)
+            if delivered:
+                await async_db.add_fingerprints(channel_id, {entry.fingerprint for entry in delivered})
+
+        if plan.defer:
+            self._backlog[url] = (plan.defer, result)
+        else:
+            self._backlog.pop(url, None)
+            # Keep the old validators while anything is unposted, so the next poll gets
+            # the full body back and still sees those entries.
+            if not failed:
+                await self._save_validators(feed_config, result)
+
+        details = [f"posted {len(delivered)}/{len(plan.post) - len(duplicates)}"]
+        if duplicates:
+            details.append(f"skipped {len(duplicates)} already posted by another feed")
+        if plan.skip:
+            details.append(f"marked {len(plan.skip)} seen without posting")
+        if plan.defer:
+            details.append(f"{len(plan.defer)} deferred to later cycles")
+        print(f"[RSS] {feed_name}: {', '.join(details)}.")
+
+    async def _drain_backlogs(self, skip_urls: set):
+        """Post the next share of each feed's deferred entries without refetching it."""
+        now = datetime.now(timezone.utc)
+        drains = []
+        for url, (entries, result) in list(self._backlog.items()):
+            feed_config = self._feeds.get(url)
+            if feed_config is None:
+                del self._backlog[url]
+                continue
+            if url in skip_urls:
+                continue
+            plan = plan_catch_up(
+                entries,
+                CatchUpPolicy.for_feed(feed_config),
+                now,
+                digest_threshold=feed_config.get("digest_threshold"),
+            )
+            drains.append(self._post_plan(feed_config, plan, result))
+        if drains:
+            await asyncio.gather(*drains, return_exceptions=True)
+
+    async def _resolve_channel(self, channel_id: int):
+        channel = self.bot.get_channel(channel_id)
+        if channel:
+            return channel
+        try:
+            return await self.bot.fetch_channel(channel_id)
+        except Exception as e:
+            print(f"[RSS] Could not find channel {channel_id}: {e}")
+            return None
+
+    def _claim_fingerprints(self, channel_id: int, entries: list[FeedEntry]) -> tuple[list[FeedEntry], list[FeedEntry]]:
+        """Split entries into ones to post and ones the channel already has from some feed.
+
+        Fingerprints are claimed before any await, so two feeds polled concurrently for
+        the same channel can't both post the same item.
+        """
+        claimed = self._fingerprints.setdefault(channel_id, set())
+        to_post, duplicates = [], []
+        for entry in entries:
+            if entry.fingerprint in claimed:
+                duplicates.append(entry)
+            else:
+                claimed.add(entry.fingerprint)
+                to_post.append(entry)
+        return to_post, duplicates
+
+    def _release_fingerprints(self, channel_id: int, entries: list[FeedEntry]):
+        """Give back the claims of entries that failed to post so a later poll can retry them."""
+        claimed = self._fingerprints.get(channel_id, set())
+        for entry in entries:
+            claimed.discard(entry.fingerprint)
+
+    async def _mark_seen(self, url: str, hashes):
+        await async_db.add_seen_hashes(url, hashes)
+        self._seen.setdefault(url, set()).update(hashes)
+
+    async def _save_validators(self, feed_config: dict, result: FeedResult):
+        etag, modified = result.etag, result.modified
+        if (etag, modified) != (feed_config.get("etag"), feed_config.get("modified")):
+            await async_db.save_feed_validators(feed_config["url"], etag, modified)
 
     @poll_feeds.before_loop
     async def before_poll_feeds(self):
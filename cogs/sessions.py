@@ -1,16 +1,10 @@
-import os
-
 import discord
 from discord.ext import commands
 from discord import app_commands
 
-from utils import db
+from utils import async_db
 from utils.session_format import build_gotime_embed
-from utils.warhorn_api import (
-    WarhornClient,
-    find_current_session,
-    parse_warhorn_dt,
-)
+from utils.warhorn_api import find_current_session, parse_warhorn_dt
 from utils.wishlist_format import (
     build_browse_catalog,
     build_wishlist_catalog,
@@ -18,8 +12,6 @@ from utils.wishlist_format import (
     resolve_wishlist_number,
 )
 
-WARHORN_SLUG = "pandodnd"
-WARHORN_API_ENDPOINT = "https://warhorn.net/graphql"
 DAN_TEXT_CHANNEL_ID = 701628514004238416
 DAN_SESSION_LOGS_CHANNEL_ID = 1324201074382344213
 REWARDS_STATIC = "10 downtime, level if you want it"
@@ -44,8 +36,8 @@ def _format_all_wishlists(entries: list[dict]) -> str:
     return "\n\n".join(sections)
 
 
-def _wishlist_browse_embed(*, include_requesters: bool = False) -> discord.Embed | None:
-    catalog = _wishlist_browse_catalog()
+async def _wishlist_browse_embed(*, include_requesters: bool = False) -> discord.Embed | None:
+    catalog = await _wishlist_browse_catalog()
     if not catalog:
         return None
 
@@ -64,8 +56,11 @@ def _wishlist_browse_embed(*, include_requesters: bool = False) -> discord.Embed
     return embed
 
 
-def _wishlist_browse_catalog() -> list[dict]:
-    return build_browse_catalog(db.get_adventure_wishlist(), db.get_recent_warhorn_sessions(limit=8))
+async def _wishlist_browse_catalog() -> list[dict]:
+    return build_browse_catalog(
+        await async_db.get_adventure_wishlist(),
+        await async_db.get_recent_warhorn_sessions(limit=8),
+    )
 
 
 class Sessions(commands.Cog):
@@ -75,7 +70,7 @@ class Sessions(commands.Cog):
     )
     def __init__(self, bot):
         self.bot = bot
-        self.warhorn_client = WarhornClient(WARHORN_API_ENDPOINT, os.getenv("WARHORN_APPLICATION_TOKEN"))
+        self.warhorn_snapshots = bot.warhorn_snapshots
 
     async def _get_channel(self, channel_id: int):
         channel = self.bot.get_channel(channel_id)
@@ -83,10 +78,9 @@ class Sessions(commands.Cog):
             channel = await self.bot.fetch_channel(channel_id)
         return channel
 
-    def _warhorn_current_session_name(self) -> str | None:
+    async def _warhorn_current_session_name(self) -> str | None:
         try:
-            result = self.warhorn_client.get_sessions_for_gotime(WARHORN_SLUG)
-            nodes = result.get("data", {}).get("eventSessions", {}).get("nodes", [])
+            nodes = (await self.warhorn_snapshots.get()).nodes
         except Exception as e:
             print(f"[Sessions] Warhorn fetch failed: {e}")
             return None
@@ -97,11 +91,11 @@ class Sessions(commands.Cog):
         session = find_current_session(nodes)
         return session.get("name") if session else None
 
-    def _derive_adventure_name(self, rewards_session: dict | None = None) -> str | None:
-        session = rewards_session if rewards_session is not None else db.get_rewards_session()
+    async def _derive_adventure_name(self, rewards_session: dict | None = None) -> str | None:
+        session = rewards_session if rewards_session is not None else await async_db.get_rewards_session()
         if session and session.get("session_name"):
             return session["session_name"]
-        return self._warhorn_current_session_name()
+        return await self._warhorn_current_session_name()
 
     @staticmethod
     def _format_participant_mentions(participant_ids: list[int]) -> str:
@@ -130,18 +124,15 @@ class Sessions(commands.Cog):
             message = f"{message}\n{mentions}"
         return message
 
-    def _fetch_current_warhorn_session(self) -> tuple[dict | None, str | None]:
+    async def _fetch_current_warhorn_session(self) -> tuple[dict | None, str | None]:
         try:
-            result = self.warhorn_client.get_sessions_for_gotime(WARHORN_SLUG)
-            nodes = result.get("data", {}).get("eventSessions", {}).get("nodes", [])
+            nodes = (await self.warhorn_snapshots.get()).nodes
         except Exception as e:
             return None, f"Failed to fetch Warhorn sessions: {e}"
 
         if not nodes:
             return None, "No Warhorn sessions found for today."
 
-        db.record_warhorn_sessions(nodes)
-
         session = find_current_session(nodes)
         if not session:
             return None, "Could not determine the current Warhorn session."
@@ -149,12 +140,12 @@ class Sessions(commands.Cog):
         return session, None
 
     @staticmethod
-    def _collect_voice_players(voice_channel) -> list[dict]:
+    async def _collect_voice_players(voice_channel) -> list[dict]:
+        members = [member for member in voice_channel.members if not member.bot]
+        selections = await async_db.get_character_selections([member.id for member in members])
         player_data = []
-        for member in voice_channel.members:
-            if member.bot:
-                continue
-            selection = db.get_character_selection(member.id)
+        for member in members:
+            selection = selections.get(member.id)
             player_data.append({
                 "user_id": member.id,
                 "display_name": member.display_name,
@@ -169,25 +160,25 @@ class Sessions(commands.Cog):
             return
 
         voice_channel = interaction.user.voice.channel
-        player_data = self._collect_voice_players(voice_channel)
+        player_data = await self._collect_voice_players(voice_channel)
 
         if not player_data:
             await interaction.followup.send("No players found in your voice channel.", ephemeral=True)
             return
 
         if not preview:
-            cleared = db.clear_stale_session_selections()
+            cleared = await async_db.clear_stale_session_selections()
             if cleared:
                 print(f"[Sessions] Cleared {cleared} stale character selection(s) from prior sessions.")
 
-        session, error = self._fetch_current_warhorn_session()
+        session, error = await self._fetch_current_warhorn_session()
         if error:
             await interaction.followup.send(error, ephemeral=True)
             return
 
         if not preview:
             starts_at = parse_warhorn_dt(session["startsAt"])
-            session_db_id = db.upsert_session(
+            session_db_id = await async_db.upsert_session(
                 session["id"],
                 session["name"],
                 starts_at,
@@ -195,7 +186,7 @@ class Sessions(commands.Cog):
                 interaction.user.id,
             )
             for player in player_data:
-                db.upsert_session_player(
+                await async_db.upsert_session_player(
                     session_db_id,
                     player["user_id"],
                     player["display_name"],
@@ -209,7 +200,7 @@ class Sessions(commands.Cog):
     @wishlist_group.command(name="browse", description="View adventures others have requested, numbered for easy joining.")
     async def wishlist_browse(self, interaction: discord.Interaction):
         is_admin = bool(interaction.user.guild_permissions.administrator)
-        embed = _wishlist_browse_embed(include_requesters=is_admin)
+        embed = await _wishlist_browse_embed(include_requesters=is_admin)
         if not embed:
             await interaction.response.send_message(
                 "No adventures on the wishlist yet. Use `/wishlist add adventure:...` to request one.",
@@ -240,7 +231,7 @@ class Sessions(commands.Cog):
 
         if adventure is None and number is None:
             is_admin = bool(interaction.user.guild_permissions.administrator)
-            embed = _wishlist_browse_embed(include_requesters=is_admin)
+            embed = await _wishlist_browse_embed(include_requesters=is_admin)
             if not embed:
                 await interaction.response.send_message(
                     "No adventures on the wishlist yet. Use `/wishlist add adventure:...` to request one.",
@@ -251,7 +242,7 @@ class Sessions(commands.Cog):
             return
 
         if number is not None:
-            catalog = _wishlist_browse_catalog()
+            catalog = await _wishlist_browse_catalog()
             resolved = resolve_wishlist_number(catalog, number)
             if not resolved:
                 await interaction.response.send_message(
@@ -281,7 +272,7 @@ class Sessions(commands.Cog):
         target = player or interaction.user
         added_by_other = target.id != interaction.user.id
 
-        newly_added = db.add_adventure_wishlist(
+        newly_added = await async_db.add_adventure_wishlist(
             target.id,
             adventure,
             target.display_name,
@@ -331,7 +322,7 @@ class Sessions(commands.Cog):
         target = player or interaction.user
         added_by_other = target.id != interaction.user.id
 
-        if not db.remove_adventure_wishlist(target.id, adventure):
+        if not await async_db.remove_adventure_wishlist(target.id, adventure):
             await interaction.response.send_message(
                 f"{target.display_name} hasn't wishlisted **{adventure}**.",
                 ephemeral=True,
@@ -367,7 +358,7 @@ class Sessions(commands.Cog):
                 )
                 return
 
-            entries = db.get_adventure_wishlist()
+            entries = await async_db.get_adventure_wishlist()
             body = _format_all_wishlists(entries)
             title = "Adventure Wishlist"
         elif player and player.id != interaction.user.id:
@@ -378,11 +369,11 @@ class Sessions(commands.Cog):
                 )
                 return
 
-            entries = db.get_adventure_wishlist_for_user(player.id)
+            entries = await async_db.get_adventure_wishlist_for_user(player.id)
             body = _format_user_wishlist(entries)
             title = f"{player.display_name}'s Wishlist"
         else:
-            entries = db.get_adventure_wishlist_for_user(interaction.user.id)
+            entries = await async_db.get_adventure_wishlist_for_user(interaction.user.id)
             body = _format_user_wishlist(entries)
             title = "Your Adventure Wishlist"
 
@@ -423,10 +414,10 @@ class Sessions(commands.Cog):
     ):
         await interaction.response.defer(ephemeral=True)
 
-        rewards_session = db.get_rewards_session()
-        resolved_adventure = adventure or self._derive_adventure_name(rewards_session)
+        rewards_session = await async_db.get_rewards_session()
+        resolved_adventure = adventure or await self._derive_adventure_name(rewards_session)
         participant_ids = (
-            db.get_session_players(rewards_session["id"]) if rewards_session else []
+            await async_db.get_session_players(rewards_session["id"]) if rewards_session else []
         )
 
         try:
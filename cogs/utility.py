@@ -2,13 +2,53 @@ import random
 import requests
 import json
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 
+from utils import db
+
+STATS_LOG_MINUTES = 60
+
+
+def format_stats(label: str, stats: dict) -> str:
+    values = ", ".join(
+        f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}" for key, value in stats.items()
+    )
+    return f"{label}: {values}"
+
+
 class Utility(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_load(self):
+        self.log_stats.start()
+
+    async def cog_unload(self):
+        self.log_stats.cancel()
+
+    def _collect_stats(self) -> list[tuple[str, dict]]:
+        collected = [("db pool", db.pool_stats()), ("warhorn", self.bot.warhorn_snapshots.stats)]
+        characters = self.bot.get_cog("Characters")
+        if characters is not None:
+            collected.append(("ddb", characters.ddb.stats))
+            collected.append(("character cache", characters.characters.stats))
+            collected.append(("character links", characters.link_stats))
+        return collected
+
+    @tasks.loop(minutes=STATS_LOG_MINUTES)
+    async def log_stats(self):
+        """One line per component, so pool pressure and cache hit rates show up in the logs."""
+        try:
+            for label, stats in self._collect_stats():
+                print(f"[Stats] {format_stats(label, stats)}")
+        except Exception as e:
+            print(f"[Stats] Could not collect stats: {e}")
+
+    @log_stats.before_loop
+    async def before_log_stats(self):
+        await self.bot.wait_until_ready()
+
     @staticmethod
     def _is_admin(interaction: discord.Interaction) -> bool:
         return bool(interaction.guild and interaction.user.guild_permissions.administrator)
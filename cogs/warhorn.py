@@ -1,39 +1,62 @@
-import os
-import json
-import re
 import asyncio
-from datetime import datetime, timezone
-import requests
+import time
+from datetime import timedelta
 
+import aiohttp
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-from utils import db
-from utils.warhorn_api import WarhornClient
+from utils import async_db
+from utils.schedule_diff import ScheduleChange, diff_schedules, format_schedule_changes
+from utils.schedule_format import build_schedule_embed, schedule_digest, with_as_of
+from utils.warhorn_snapshots import WarhornSnapshot
+
+SCHEDULE_MAX_AGE = timedelta(minutes=15)
+REPOST_DEBOUNCE_SECONDS = 60
+WATCH_UPDATE_CONCURRENCY = 5
+DM_CONCURRENCY = 5
+# Consecutive undeliverable DMs (DMs closed, account gone) before a subscriber is skipped.
+# Running /notify while skipped resumes their DMs and clears the count.
+SUBSCRIBER_MAX_FAILURES = 3
+# Embed descriptions are capped at 4096 characters.
+SCHEDULE_CHANGES_LIMIT = 4000
 
 class Warhorn(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.watched_schedules = {}
+        self.schedule_hashes: dict[int, str | None] = {}
+        # Upcoming sessions as of the last tick; subscribers are told what changed since then.
+        self._notified_sessions: list | None = None
+        self.warhorn_snapshots = bot.warhorn_snapshots
+        self._schedule_cache: tuple[WarhornSnapshot, discord.Embed, list] | None = None
+        # Newest message id seen per watched channel, kept current by on_message so the loop
+        # can tell whether the schedule is still at the bottom without a history() call
+        # (one is made only after that newest message is deleted).
+        self.last_message_ids: dict[int, int] = {}
+        # Channels whose tracked newest message was deleted; re-read before trusting the id.
+        self._unverified_last_ids: set[int] = set()
+        self._repost_tasks: dict[int, asyncio.Task] = {}
+        self._channel_locks: dict[int, asyncio.Lock] = {}
+        self._dm_channels: dict[int, discord.DMChannel] = {}
+
+    async def cog_load(self):
         timestamp = discord.utils.utcnow().strftime("%Y-%m-%d %H:%M:%S")
 
-        self.watched_schedules = db.load_all_watched_schedules()
+        self.watched_schedules = await async_db.load_all_watched_schedules()
+        self.schedule_hashes = {
+            channel_id: data.get("schedule_hash") for channel_id, data in self.watched_schedules.items()
+        }
         if self.watched_schedules:
             print(f"[{timestamp}] Watched schedules loaded from database (IDs only, messages will be fetched).")
 
-        self.last_warhorn_sessions_data = db.load_all_last_sessions()
-        if self.last_warhorn_sessions_data:
-            print(f"[{timestamp}] Last Warhorn sessions data loaded from database.")
-
-        self.global_sessions_json = None
-
-        WARHORN_APPLICATION_TOKEN = os.getenv("WARHORN_APPLICATION_TOKEN")
-        WARHORN_API_ENDPOINT = "https://warhorn.net/graphql"
-        self.warhorn_client = WarhornClient(WARHORN_API_ENDPOINT, WARHORN_APPLICATION_TOKEN)
-
         self.update_warhorn_schedule.start()
 
     def cog_unload(self):
         self.update_warhorn_schedule.cancel()
+        for task in self._repost_tasks.values():
+            task.cancel()
+        self._repost_tasks.clear()
 
     @staticmethod
     def _chan_label(ch) -> str:
@@ -73,6 +96,7 @@ class Warhorn(commands.Cog):
                 if channel:
                     message = await channel.fetch_message(message_id)
                     self.watched_schedules[channel_id] = message
+                    await self._seed_last_message_id(channel, message)
                     chan_label = self._chan_label(channel)
                     print(f"[{current_time}] Successfully fetched watched message {message_id} in {chan_label} ({channel_id}).")
                 else:
@@ -91,103 +115,137 @@ class Warhorn(commands.Cog):
         for ch_id in channels_to_remove:
             if ch_id in self.watched_schedules:
                 del self.watched_schedules[ch_id]
-            if ch_id in self.last_warhorn_sessions_data:
-                del self.last_warhorn_sessions_data[ch_id]
-            db.remove_watched_schedule(ch_id)
-            db.remove_last_sessions(ch_id)
-
-    async def get_warhorn_embed_and_data(self, full: bool): 
-        desc_text = "The following games are upcoming on this server, click on a link to schedule a seat.\n\n"
-        pandodnd_slug = "pandodnd"
+            self.schedule_hashes.pop(ch_id, None)
+            await async_db.remove_watched_schedule(ch_id)
+
+    async def _seed_last_message_id(self, channel, schedule_message: discord.Message):
+        last_id = getattr(channel, "last_message_id", None)
+        if last_id is None:
+            # DM and group channels don't cache their last message id; ask once at startup.
+            try:
+                async for m in channel.history(limit=1):
+                    last_id = m.id
+            except Exception as e:
+                print(f"Could not read latest message in {self._chan_label(channel)}: {e}")
+        self._note_channel_activity(channel.id, last_id or schedule_message.id)
+
+    def _note_channel_activity(self, channel_id: int, message_id: int):
+        if message_id > self.last_message_ids.get(channel_id, 0):
+            self.last_message_ids[channel_id] = message_id
+            self._unverified_last_ids.discard(channel_id)
+
+    async def _is_buried(self, channel_id: int, schedule_message: discord.Message) -> bool:
+        if channel_id in self._unverified_last_ids:
+            await self._reread_last_message_id(channel_id, schedule_message)
+        return self.last_message_ids.get(channel_id, 0) > schedule_message.id
+
+    async def _reread_last_message_id(self, channel_id: int, schedule_message: discord.Message):
+        # Deletions don't move channel.last_message_id back either, so ask Discord once.
         try:
-            initial_result = self.warhorn_client.get_event_sessions(pandodnd_slug)
+            last_id = schedule_message.id
+            async for m in schedule_message.channel.history(limit=1):
+                last_id = m.id
+        except Exception as e:
+            print(f"Could not read latest message in {self._chan_label(schedule_message.channel)}: {e}")
+            return
+        self._unverified_last_ids.discard(channel_id)
+        self.last_message_ids[channel_id] = last_id
 
-            if "data" not in initial_result or "eventSessions" not in initial_result["data"] or "nodes" not in initial_result["data"]["eventSessions"]:
-                print("Unexpected Warhorn API response structure or no data from initial fetch.")
-                return discord.Embed(title="Schedule Error", description="Could not retrieve schedule from Warhorn. Please try again later.", color=discord.Color.red()), []
+    def _forget_channel(self, channel_id: int):
+        self.last_message_ids.pop(channel_id, None)
+        self._unverified_last_ids.discard(channel_id)
+        task = self._repost_tasks.pop(channel_id, None)
+        if task:
+            task.cancel()
 
-            sessions_to_display = sorted(
-                initial_result["data"]["eventSessions"]["nodes"],
-                key=lambda x: datetime.fromisoformat(x["startsAt"].replace("Z", "+00:00"))
-            )
-            db.record_warhorn_sessions(sessions_to_display)
+    def _channel_lock(self, channel_id: int) -> asyncio.Lock:
+        return self._channel_locks.setdefault(channel_id, asyncio.Lock())
 
-            if not sessions_to_display:
-                embed = discord.Embed(title="Upcoming Warhorn Events", description="No upcoming sessions found.", color=discord.Color.blue())
-                return embed, sessions_to_display
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        channel_id = message.channel.id
+        schedule_message = self.watched_schedules.get(channel_id)
+        if not isinstance(schedule_message, discord.Message):
+            return
 
-            for session in sessions_to_display: 
-                session_name = session["name"]
-                
-                session_uuid = session.get("uuid")
-                if session_uuid:
-                    warhorn_url = f"https://warhorn.net/events/{pandodnd_slug}/schedule/sessions/{session_uuid}"
-                else:
-                    warhorn_url = f"https://warhorn.net/events/{pandodnd_slug}/schedule" 
-                
-                session_start_str = session["startsAt"]
-                gm_name = session["gmSignups"][0]["user"]["name"] if session["gmSignups"] else "No GM"
-                available_seats = session["availablePlayerSeats"]
-                
-                parsed_player_names = []
-                for signup in session["playerSignups"]:
-                    full_player_name = signup["user"]["name"]
-                    match = re.match(r"^(.*?)(?:\s*\((.*)\))?$", full_player_name)
-                    if match:
-                        discord_tag_or_primary_name = match.group(1).strip()
-                        real_name_in_parentheses = match.group(2)
-                        if real_name_in_parentheses:
-                            parsed_player_names.append(f"{real_name_in_parentheses} ({discord_tag_or_primary_name})")
-                        else:
-                            parsed_player_names.append(discord_tag_or_primary_name)
-                    else:
-                        parsed_player_names.append(full_player_name)
-
-                if parsed_player_names:
-                    players_list_str = ", ".join(parsed_player_names)
-                else:
-                    players_list_str = "No players signed up"
-
-                waitlist_names = []
-                if session.get("playerWaitlistEntries"): 
-                    for entry in session["playerWaitlistEntries"]:
-                        if entry.get("user") and entry["user"].get("name"):
-                            waitlist_names.append(entry["user"]["name"])
-
-                status_line = ""
-                if available_seats > 0:
-                    status_line = f"* 🟢 **Status:** {available_seats} slots available!"
-                elif waitlist_names: 
-                    status_line = f"* 🟡 **Waitlist:** {', '.join(waitlist_names)}"
-                else:
-                    status_line = "* 🟡 **Status:** Full (empty waitlist) "
+        self._note_channel_activity(channel_id, message.id)
+        if message.id > schedule_message.id:
+            self._schedule_repost(channel_id)
 
-                utc_dt = datetime.fromisoformat(session_start_str.replace("Z", "+00:00"))
-                unix_timestamp = int(utc_dt.timestamp())
-                time_str = f"<t:{unix_timestamp}:F>"
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        self._note_channel_deletions(payload.channel_id, {payload.message_id})
 
-                session_block = f"**[{session_name}]({warhorn_url})**  \n"
-                session_block += f"* 📅 **When:** {time_str}  \n"
-                session_block += f"* 🧙‍ **GM:** ️ {gm_name}  \n"
-                session_block += f"* 👥 **Players:** {players_list_str}  \n"
-                session_block += f"{status_line}  \n\n"
-                
-                desc_text += session_block 
-
-            desc_text += ("*Join the waitlist to be next in line if there is a cancellation.*\n"
-                          "*If you are on a waitlist, you may still get a spot due to cancellations.*\n"
-                          "*Use `/wishlist browse` to see what others have requested, then `/wishlist add number:` to join one. "
-                          "Use `/wishlist add adventure:` for something new. "
-                          "When I schedule your wishlist adventure, I can sign you up in advance.*\n")
-            embed = discord.Embed(
-                title="Upcoming Warhorn Events",
-                description=desc_text, 
-                color=discord.Color.blue(),
-                url=f"https://warhorn.net/events/{pandodnd_slug}/schedule"
-            )
-            return embed, sessions_to_display 
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        self._note_channel_deletions(payload.channel_id, payload.message_ids)
+
+    def _note_channel_deletions(self, channel_id: int, message_ids: set[int]):
+        if self.last_message_ids.get(channel_id) in message_ids:
+            self._unverified_last_ids.add(channel_id)
+
+    def _schedule_repost(self, channel_id: int):
+        # Debounced: a burst of chat only moves the schedule once things settle down.
+        pending = self._repost_tasks.get(channel_id)
+        if pending:
+            pending.cancel()
+        self._repost_tasks[channel_id] = asyncio.create_task(self._debounced_repost(channel_id))
+
+    async def _debounced_repost(self, channel_id: int):
+        try:
+            await asyncio.sleep(REPOST_DEBOUNCE_SECONDS)
+        except asyncio.CancelledError:
+            return
+        if self._repost_tasks.get(channel_id) is asyncio.current_task():
+            del self._repost_tasks[channel_id]
+
+        snapshot = self.warhorn_snapshots.latest
+        if snapshot is None:
+            return
+        new_embed, new_sessions_data = self._schedule_view(snapshot)
+        new_hash = schedule_digest(new_sessions_data, new_embed)
+
+        async with self._channel_lock(channel_id):
+            message_object = self.watched_schedules.get(channel_id)
+            if not isinstance(message_object, discord.Message) or not await self._is_buried(channel_id, message_object):
+                return
+            try:
+                await self._repost_schedule(channel_id, message_object, new_embed, new_hash)
+            except Exception as e:
+                print(f"Error while reposting schedule in {self._chan_label(message_object.channel)}: {e}")
+
+    async def _repost_schedule(self, channel_id: int, message_object: discord.Message, new_embed: discord.Embed, new_hash: str):
+        channel = message_object.channel
+        chan_label = self._chan_label(channel)
+        print(f"Schedule is not the last message in {chan_label}. Reposting at the bottom...")
+        try:
+            await message_object.delete()
+        except:
+            pass
 
-        except requests.exceptions.RequestException as e:
+        new_msg = await channel.send(embed=new_embed)
+        self.watched_schedules[channel_id] = new_msg
+        self.schedule_hashes[channel_id] = new_hash
+        self._note_channel_activity(channel_id, new_msg.id)
+        await async_db.save_watched_schedule(channel_id, new_msg.id, new_hash)
+        print(f"Reposted schedule as message {new_msg.id} in {chan_label}.")
+
+    def _schedule_view(self, snapshot: WarhornSnapshot) -> tuple[discord.Embed, list]:
+        # The embed only changes when the snapshot does, so build it once per snapshot.
+        if self._schedule_cache is None or self._schedule_cache[0] is not snapshot:
+            sessions_to_display = snapshot.upcoming()
+            self._schedule_cache = (snapshot, build_schedule_embed(sessions_to_display), sessions_to_display)
+        _, embed, sessions_to_display = self._schedule_cache
+        return embed.copy(), sessions_to_display
+
+    async def get_warhorn_embed_and_data(self, full: bool, max_age: timedelta | None = None):
+        try:
+            snapshot = await self.warhorn_snapshots.get(max_age)
+            return self._schedule_view(snapshot)
+        except ValueError:
+            print("Unexpected Warhorn API response structure or no data from initial fetch.")
+            return discord.Embed(title="Schedule Error", description="Could not retrieve schedule from Warhorn. Please try again later.", color=discord.Color.red()), []
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"Error fetching Warhorn schedule: {e}")
             return discord.Embed(title="Schedule Error", description=f"Could not retrieve schedule from Warhorn due to a network error: {e}", color=discord.Color.red()), []
         except Exception as e:
@@ -201,11 +259,23 @@ class Warhorn(commands.Cog):
         app_commands.Choice(name="Full Details (Includes Waitlist)", value=1)
     ])
     async def schedule(self, interaction: discord.Interaction, view_type: app_commands.Choice[int] = None):
-        await interaction.response.defer()
         # Default to False (Summary View) if not provided
         is_full = view_type.value == 1 if view_type else False
-        embed_to_send, _ = await self.get_warhorn_embed_and_data(is_full)
-        await interaction.followup.send(embed=embed_to_send, ephemeral=True)
+
+        # The schedule loop keeps the snapshot warm, so this normally answers straight from memory.
+        snapshot = self.warhorn_snapshots.latest
+        if snapshot is not None and snapshot.age() <= SCHEDULE_MAX_AGE:
+            embed_to_send, _ = self._schedule_view(snapshot)
+            await interaction.response.send_message(embed=with_as_of(embed_to_send, snapshot.fetched_at))
+            return
+
+        await interaction.response.defer()
+        embed_to_send, _ = await self.get_warhorn_embed_and_data(is_full, max_age=SCHEDULE_MAX_AGE)
+        snapshot = self.warhorn_snapshots.latest
+        if embed_to_send.color != discord.Color.red() and snapshot is not None:
+            embed_to_send = with_as_of(embed_to_send, snapshot.fetched_at)
+        # The first followup after a public defer is public too, whatever its ephemeral flag says.
+        await interaction.followup.send(embed=embed_to_send)
 
     @app_commands.command(name="watch", description="Watches this channel for Warhorn updates, keeping the schedule at the bottom.")
     async def watch(self, interaction: discord.Interaction):
@@ -241,11 +311,12 @@ class Warhorn(commands.Cog):
             )
             return
 
+        schedule_hash = schedule_digest(sessions_data, embed_to_send)
         self.watched_schedules[channel_id] = message
-        self.last_warhorn_sessions_data[channel_id] = sessions_data
+        self.schedule_hashes[channel_id] = schedule_hash
+        self._note_channel_activity(channel_id, message.id)
 
-        db.save_watched_schedule(channel_id, message.id)
-        db.save_last_sessions(channel_id, sessions_data)
+        await async_db.save_watched_schedule(channel_id, message.id, schedule_hash)
 
         print(f"Set to watch {self._chan_label(interaction.channel)} ({channel_id}) with message ID {message.id}.")
         await interaction.followup.send(f"This channel is now being watched for Warhorn schedule updates. I will keep the schedule at the bottom of the channel.", ephemeral=True)
@@ -255,9 +326,9 @@ class Warhorn(commands.Cog):
         channel_id = interaction.channel.id
         if channel_id in self.watched_schedules:
             message_object = self.watched_schedules.pop(channel_id)
-            self.last_warhorn_sessions_data.pop(channel_id, None)
-            db.remove_watched_schedule(channel_id)
-            db.remove_last_sessions(channel_id)
+            self.schedule_hashes.pop(channel_id, None)
+            self._forget_channel(channel_id)
+            await async_db.remove_watched_schedule(channel_id)
 
             try:
                 if isinstance(message_object, discord.Message):
@@ -275,105 +346,113 @@ class Warhorn(commands.Cog):
 
     @tasks.loop(minutes=10)
     async def update_warhorn_schedule(self):
-        if not self.bot.is_ready() or not self.watched_schedules:
-            print("Scheduled update skipped: Bot not ready or no channels watched.")
+        if not self.bot.is_ready():
+            print("Scheduled update skipped: Bot not ready.")
             return
 
         print("Running scheduled Warhorn schedule update check...")
-        new_embed, new_sessions_data = await self.get_warhorn_embed_and_data(False) 
+        new_embed, new_sessions_data = await self.get_warhorn_embed_and_data(False)
 
         if new_embed.color == discord.Color.red():
             print("Scheduled update: Error fetching new Warhorn data. Skipping update for all channels.")
             return
 
         try:
-            new_sessions_json = json.dumps(new_sessions_data, sort_keys=True, default=str)
-            new_embed_sig = json.dumps(new_embed.to_dict(), sort_keys=True, default=str)
+            new_hash = schedule_digest(new_sessions_data, new_embed)
         except Exception as e:
-            print(f"Error serializing new embed/sessions for comparison: {e}")
+            print(f"Error hashing new embed/sessions for comparison: {e}")
             return
 
-        if self.global_sessions_json is None:
-            self.global_sessions_json = new_sessions_json
-        elif new_sessions_json != self.global_sessions_json:
-            self.global_sessions_json = new_sessions_json
-            await self._notify_subscribers(new_sessions_data)
+        if self._notified_sessions is not None:
+            changes = diff_schedules(self._notified_sessions, new_sessions_data)
+            if changes:
+                await self._notify_subscribers(changes)
+        self._notified_sessions = new_sessions_data
 
-        channels_to_remove = []
-        for channel_id, message_object in list(self.watched_schedules.items()):
-            if not isinstance(message_object, discord.Message):
-                continue
+        channel_ids = [
+            channel_id for channel_id, message_object in self.watched_schedules.items()
+            if isinstance(message_object, discord.Message)
+        ]
+        channels_to_remove = await self._update_watched_channels(channel_ids, new_embed, new_hash)
 
-            try:
-                channel = message_object.channel
-                chan_label = self._chan_label(channel)
+        for ch_id in channels_to_remove:
+            if ch_id in self.watched_schedules:
+                del self.watched_schedules[ch_id]
+            self.schedule_hashes.pop(ch_id, None)
+            self._forget_channel(ch_id)
+            await async_db.remove_watched_schedule(ch_id)
+
+    async def _update_watched_channels(
+        self,
+        channel_ids: list[int],
+        new_embed: discord.Embed,
+        new_hash: str,
+    ) -> list[int]:
+        """Update watched channels concurrently. Returns the channels whose watch should be dropped.
+
+        discord.py already queues each request behind its route's rate-limit bucket (and the
+        global limit), and every channel is its own bucket, so the semaphore only caps how
+        many channels are in flight at once.
+        """
+        if not channel_ids:
+            return []
+
+        semaphore = asyncio.Semaphore(WATCH_UPDATE_CONCURRENCY)
+
+        async def update_one(channel_id: int) -> tuple[int, bool, float]:
+            async with semaphore:
+                started = time.perf_counter()
+                async with self._channel_lock(channel_id):
+                    remove = await self._update_watched_channel(channel_id, new_embed, new_hash)
+                return channel_id, remove, (time.perf_counter() - started) * 1000
+
+        tick_started = time.perf_counter()
+        results = await asyncio.gather(*(update_one(channel_id) for channel_id in channel_ids))
+        total_ms = (time.perf_counter() - tick_started) * 1000
+
+        timings = ", ".join(
+            f"{channel_id}={elapsed_ms:.0f}ms"
+            for channel_id, _, elapsed_ms in sorted(results, key=lambda r: r[2], reverse=True)
+        )
+        print(f"Updated {len(results)} watched channel(s) in {total_ms:.0f}ms ({timings}).")
+        return [channel_id for channel_id, remove, _ in results if remove]
 
-                try:
-                    last_message = None
-                    async for m in channel.history(limit=1):
-                        last_message = m
-                    if last_message and last_message.id != message_object.id:
-                        print(f"Schedule is not the last message in {chan_label}. Reposting at the bottom...")
-                        try:
-                            await message_object.delete()
-                        except:
-                            pass
-
-                        new_msg = await channel.send(embed=new_embed)
-                        self.watched_schedules[channel_id] = new_msg
-                        self.last_warhorn_sessions_data[channel_id] = new_sessions_data
-                        db.save_watched_schedule(channel_id, new_msg.id)
-                        db.save_last_sessions(channel_id, new_sessions_data)
-                        print(f"Reposted schedule as message {new_msg.id} in {chan_label}.")
-                        continue
-                except Exception as e:
-                    print(f"Error while ensuring bottom message in {chan_label}: {e}")
+    async def _update_watched_channel(self, channel_id: int, new_embed: discord.Embed, new_hash: str) -> bool:
+        """Bring one watched channel's schedule up to date. Returns True if the watch should be dropped."""
+        message_object = self.watched_schedules.get(channel_id)
+        if not isinstance(message_object, discord.Message):
+            return False
 
+        try:
+            channel = message_object.channel
+            chan_label = self._chan_label(channel)
+
+            if await self._is_buried(channel_id, message_object):
                 try:
-                    last_sessions_json = json.dumps(
-                        self.last_warhorn_sessions_data.get(channel_id, []),
-                        sort_keys=True,
-                        default=str
-                    )
+                    await self._repost_schedule(channel_id, message_object, new_embed, new_hash)
+                    return False
                 except Exception as e:
-                    last_sessions_json = "[]"
+                    print(f"Error while ensuring bottom message in {chan_label}: {e}")
 
-                current_embed_sig = None
+            if self.schedule_hashes.get(channel_id) != new_hash:
+                print(f"Updating schedule message in {chan_label}")
                 try:
-                    if message_object.embeds:
-                        current_embed_sig = json.dumps(message_object.embeds[0].to_dict(), sort_keys=True, default=str)
+                    await message_object.edit(embed=new_embed)
+                    self.schedule_hashes[channel_id] = new_hash
+                    await async_db.save_schedule_hash(channel_id, new_hash)
+                    print(f"Edited schedule message {message_object.id} in {chan_label}.")
+                except discord.NotFound:
+                    return True
+                except discord.Forbidden:
+                    return True
                 except Exception as e:
-                    print(f"Error reading current embed for message {message_object.id} in {chan_label}: {e}")
-
-                sessions_changed = (new_sessions_json != last_sessions_json)
-                embed_changed = (current_embed_sig != new_embed_sig)
-
-                if sessions_changed or embed_changed:
-                    print(f"Updating schedule message in {chan_label}")
-                    try:
-                        await message_object.edit(embed=new_embed)
-                        self.last_warhorn_sessions_data[channel_id] = new_sessions_data
-                        db.save_last_sessions(channel_id, new_sessions_data)
-                        print(f"Edited schedule message {message_object.id} in {chan_label}.")
-                    except discord.NotFound:
-                        channels_to_remove.append(channel_id)
-                    except discord.Forbidden:
-                        channels_to_remove.append(channel_id)
-                    except Exception as e:
-                        print(f"Error editing schedule message in {chan_label}: {e}")
-                else:
-                    print(f"Warhorn schedule for {chan_label} is unchanged (sessions and embed).")
+                    print(f"Error editing schedule message in {chan_label}: {e}")
+            else:
+                print(f"Warhorn schedule for {chan_label} is unchanged (sessions and embed).")
 
-            except Exception as e:
-                print(f"Unexpected error handling channel {channel_id}: {e}")
-
-        for ch_id in channels_to_remove:
-            if ch_id in self.watched_schedules:
-                del self.watched_schedules[ch_id]
-            if ch_id in self.last_warhorn_sessions_data:
-                del self.last_warhorn_sessions_data[ch_id]
-            db.remove_watched_schedule(ch_id)
-            db.remove_last_sessions(ch_id)
+        except Exception as e:
+            print(f"Unexpected error handling channel {channel_id}: {e}")
+        return False
 
     @update_warhorn_schedule.before_loop
     async def before_update_warhorn_schedule(self):
@@ -382,51 +461,87 @@ class Warhorn(commands.Cog):
         await asyncio.sleep(5)
         print("Finished initial delay for cache.")
 
-    async def _notify_subscribers(self, sessions_data: list):
-        subscriber_ids = db.get_all_subscribers()
+    async def _notify_subscribers(self, changes: list[ScheduleChange]):
+        subscriber_ids = await async_db.get_deliverable_subscribers(SUBSCRIBER_MAX_FAILURES)
         if not subscriber_ids:
             return
 
+        description = format_schedule_changes(changes, limit=SCHEDULE_CHANGES_LIMIT)
         embed = discord.Embed(
             title="P4ND0 Schedule Updated",
             url=f"https://warhorn.net/events/pandodnd/schedule",
+            description=description,
             color=discord.Color.blue(),
         )
-        for session in sessions_data[:6]:
-            starts_at = datetime.fromisoformat(session["startsAt"].replace("Z", "+00:00"))
-            unix_ts = int(starts_at.timestamp())
-            available = session.get("availablePlayerSeats", 0)
-            status = f"🟢 {available} open" if available > 0 else "🟡 Full"
-            embed.add_field(
-                name=session["name"],
-                value=f"<t:{unix_ts}:D> · {status}",
-                inline=False,
-            )
         embed.set_footer(text="Run /notify in the server to unsubscribe from these updates.")
 
-        sent = 0
-        for user_id in subscriber_ids:
-            try:
-                user = await self.bot.fetch_user(user_id)
-                await user.send(embed=embed)
-                sent += 1
-            except discord.Forbidden:
-                print(f"[Warhorn] Could not DM subscriber {user_id} — DMs may be disabled.")
-            except Exception as e:
-                print(f"[Warhorn] Error notifying subscriber {user_id}: {e}")
-        print(f"[Warhorn] Notified {sent}/{len(subscriber_ids)} subscriber(s) of schedule change.")
+        await self._deliver_dms(subscriber_ids, embed, f"{len(changes)} schedule change(s)")
+
+    async def _dm_channel(self, user_id: int) -> discord.DMChannel:
+        """DM channel for a user, from the client cache where possible rather than a REST lookup."""
+        channel = self._dm_channels.get(user_id)
+        if channel is not None:
+            return channel
+        user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+        channel = user.dm_channel or await user.create_dm()
+        self._dm_channels[user_id] = channel
+        return channel
+
+    async def _deliver_dms(self, user_ids: list[int], embed: discord.Embed, label: str):
+        """Send `embed` to each user with bounded concurrency and record who couldn't be reached.
+
+        discord.py waits out 429s on its own; the semaphore keeps a large fan-out from
+        queueing hundreds of requests against the global rate limit at once.
+        """
+        semaphore = asyncio.Semaphore(DM_CONCURRENCY)
+        delivered: list[int] = []
+        undeliverable: list[int] = []
+
+        async def send_one(user_id: int):
+            async with semaphore:
+                try:
+                    channel = await self._dm_channel(user_id)
+                    await channel.send(embed=embed)
+                    delivered.append(user_id)
+                except (discord.Forbidden, discord.NotFound):
+                    self._dm_channels.pop(user_id, None)
+                    undeliverable.append(user_id)
+                    print(f"[Warhorn] Could not DM subscriber {user_id} — DMs may be disabled.")
+                except Exception as e:
+                    print(f"[Warhorn] Error notifying subscriber {user_id}: {e}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send_one(user_id) for user_id in user_ids))
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        await async_db.reset_subscriber_failures(delivered)
+        await async_db.record_subscriber_failures(undeliverable)
+        print(
+            f"[Warhorn] Notified {len(delivered)}/{len(user_ids)} subscriber(s) of {label} "
+            f"in {elapsed_ms:.0f}ms ({len(undeliverable)} undeliverable)."
+        )
 
     @app_commands.command(name="notify", description="Toggle DM notifications when the Warhorn schedule changes.")
     async def notify(self, interaction: discord.Interaction):
         user_id = interaction.user.id
-        if db.is_subscribed(user_id):
-            db.remove_subscriber(user_id)
+        failure_count = await async_db.get_subscriber_failure_count(user_id)
+        if failure_count is not None and failure_count >= SUBSCRIBER_MAX_FAILURES:
+            # Still subscribed, but skipped since DMs stopped arriving; resume rather than unsubscribe.
+            await async_db.add_subscriber(user_id)
+            await interaction.response.send_message(
+                "Schedule notifications were paused because the bot couldn't DM you "
+                f"{failure_count} times in a row. They're back on now. Make sure DMs from server "
+                "members are allowed, and run `/notify` again to unsubscribe.",
+                ephemeral=True,
+            )
+        elif failure_count is not None:
+            await async_db.remove_subscriber(user_id)
             await interaction.response.send_message(
                 "You've been unsubscribed from schedule notifications. Run `/notify` again to re-subscribe.",
                 ephemeral=True,
             )
         else:
-            db.add_subscriber(user_id)
+            await async_db.add_subscriber(user_id)
             await interaction.response.send_message(
                 "✅ You'll now receive a DM whenever the Warhorn schedule changes. "
                 "Run `/notify` again to unsubscribe.",
@@ -0,0 +1,19 @@
+import asyncio
+import threading
+
+from utils import async_db, db
+
+
+def test_run_executes_on_database_thread_pool():
+    def which_thread(value):
+        return threading.current_thread().name, value
+
+    name, value = asyncio.run(async_db.run(which_thread, 42))
+
+    assert name.startswith("db")
+    assert value == 42
+
+
+def test_facade_mirrors_db_helpers():
+    assert async_db.get_character_selection.__wrapped__ is db.get_character_selection
+    assert asyncio.iscoroutinefunction(async_db.record_warhorn_sessions)
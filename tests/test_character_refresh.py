@@ -0,0 +1,57 @@
+import asyncio
+
+from utils.character_refresh import refresh_characters
+from utils.ddb_client import DDBCharacter
+
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = responses
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def refresh_character(self, character_id, etag=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        response = self.responses[character_id]
+        if isinstance(response, Exception):
+            raise response
+        if response is None:
+            return None, etag
+        return response
+
+
+def _row(character_id, name, etag=None):
+    return {
+        "url": f"https://www.dndbeyond.com/characters/{character_id}",
+        "name": name,
+        "avatar_url": None,
+        "ddb_etag": etag,
+    }
+
+
+def test_refresh_writes_only_changed_rows_and_counts_outcomes():
+    client = FakeClient({
+        "1": (DDBCharacter("1", "Vex'ahlia", None), '"v2"'),
+        "2": None,
+        "3": (DDBCharacter("3", "Pike", None), '"p1"'),
+        "4": ValueError("missing_data"),
+        "5": (DDBCharacter("5", "Grog", None), '"g2"'),
+    })
+    rows = [
+        _row(1, "Vex", '"v1"'),
+        _row(2, "Keyleth", '"k1"'),
+        _row(3, "Pike", '"p1"'),
+        _row(4, "Percy"),
+        _row(5, "Grog", '"g1"'),
+        {"url": "https://example.com/legacy", "name": "Old", "avatar_url": None, "ddb_etag": None},
+    ]
+
+    result = asyncio.run(refresh_characters(client, rows, concurrency=2))
+
+    assert (result.refreshed, result.unchanged, result.failed) == (1, 3, 2)
+    assert sorted(row["url"][-1] for row in result.updates) == ["1", "5"]
+    assert len(result.checked) == 4
+    assert client.max_in_flight == 2
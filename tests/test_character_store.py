@@ -0,0 +1,178 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from utils.character_store import CharacterRecord, CharacterStore, extract_character_id
+
+ROWS = {
+    1: [
+        {"url": "https://www.dndbeyond.com/characters/111", "name": "Vex", "avatar_url": None},
+        {"url": "https://www.dndbeyond.com/characters/222", "name": "Pike", "avatar_url": "a.png"},
+    ],
+    2: [{"url": "https://www.dndbeyond.com/characters/222", "name": "Pike", "avatar_url": None}],
+}
+
+
+class Loader:
+    def __init__(self, rows=ROWS):
+        self.rows = rows
+        self.calls = []
+
+    async def __call__(self, user_id):
+        self.calls.append(user_id)
+        return [dict(row) for row in self.rows.get(user_id, [])]
+
+
+def test_extract_character_id():
+    assert extract_character_id("see https://www.dndbeyond.com/characters/12345/abc") == "12345"
+    assert extract_character_id("no link here") is None
+
+
+def test_users_load_lazily_and_once_within_ttl():
+    loader = Loader()
+    store = CharacterStore(loader)
+
+    async def run():
+        first = await store.characters(1)
+        await store.characters(1)
+        return first
+
+    first = asyncio.run(run())
+
+    assert [record.name for record in first] == ["Vex", "Pike"]
+    assert loader.calls == [1]
+    assert store.stats == {"hits": 1, "misses": 1, "coalesced": 0, "evictions": 0}
+
+
+def test_least_recently_used_user_is_evicted():
+    loader = Loader()
+    store = CharacterStore(loader, max_users=1)
+
+    async def run():
+        await store.characters(1)
+        await store.characters(2)
+        await store.characters(1)
+
+    asyncio.run(run())
+
+    assert len(store) == 1
+    assert loader.calls == [1, 2, 1]
+    assert store.stats["evictions"] == 2
+
+
+def test_expired_users_are_reloaded():
+    loader = Loader()
+    store = CharacterStore(loader, ttl=0)
+
+    async def run():
+        await store.characters(1)
+        await store.characters(1)
+
+    asyncio.run(run())
+
+    assert loader.calls == [1, 1]
+
+
+def test_upsert_replaces_in_place_and_reports_new():
+    store = CharacterStore(Loader())
+
+    async def run():
+        updated = await store.upsert(1, CharacterRecord.from_url("https://www.dndbeyond.com/characters/111", "Vex'ahlia"))
+        added = await store.upsert(1, CharacterRecord.from_url("https://www.dndbeyond.com/characters/333", "Grog"))
+        return updated, added, await store.characters(1)
+
+    updated, added, characters = asyncio.run(run())
+
+    assert updated is False
+    assert added is True
+    assert [record.name for record in characters] == ["Vex'ahlia", "Pike", "Grog"]
+    assert characters[2].url.endswith("/333")
+
+
+def test_refresh_updates_every_cached_user_with_the_character():
+    store = CharacterStore(Loader())
+
+    async def run():
+        await store.characters(1)
+        await store.characters(2)
+        store.refresh("222", "Pike Trickfoot", "new.png")
+        return await store.characters(1), await store.characters(2)
+
+    first, second = asyncio.run(run())
+
+    assert [record.name for record in first] == ["Vex", "Pike Trickfoot"]
+    assert second[0].avatar_url == "new.png"
+
+
+def test_records_are_slotted():
+    record = CharacterRecord("1", "url", "name")
+
+    assert not hasattr(record, "__dict__")
+
+
+def test_search_ranks_prefixes_then_words_then_substrings_by_recency():
+    played = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = {1: [
+        {"url": "https://www.dndbeyond.com/characters/1", "name": "Scanlan Shorthalt", "avatar_url": None},
+        {"url": "https://www.dndbeyond.com/characters/2", "name": "Keyleth", "avatar_url": None},
+        {"url": "https://www.dndbeyond.com/characters/3", "name": "Taryon Darrington", "avatar_url": None},
+        {"url": "https://www.dndbeyond.com/characters/4", "name": "Sir Scanlan", "avatar_url": None,
+         "last_played": played},
+        {"url": "https://www.dndbeyond.com/characters/5", "name": "scanlan", "avatar_url": None,
+         "last_played": played - timedelta(days=1)},
+    ]}
+    store = CharacterStore(Loader(rows))
+
+    async def run():
+        return await store.search(1, " SCAN"), await store.search(1, "ryo"), await store.search(1, "", limit=2)
+
+    scan, ryo, empty = asyncio.run(run())
+
+    assert [(number, record.name) for number, record in scan] == [
+        (5, "scanlan"), (1, "Scanlan Shorthalt"), (4, "Sir Scanlan"),
+    ]
+    assert [number for number, _ in ryo] == [3]
+    assert [number for number, _ in empty] == [4, 5]
+
+
+def test_upsert_updates_search_and_keeps_last_played():
+    played = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = {1: [
+        {"url": "https://www.dndbeyond.com/characters/1", "name": "Pike", "avatar_url": None},
+        {"url": "https://www.dndbeyond.com/characters/2", "name": "Percy", "avatar_url": None,
+         "last_played": played},
+    ]}
+    store = CharacterStore(Loader(rows))
+
+    async def run():
+        await store.upsert(1, CharacterRecord.from_url("https://www.dndbeyond.com/characters/2", "Percival"))
+        await store.upsert(1, CharacterRecord.from_url("https://www.dndbeyond.com/characters/3", "Pelor"))
+        return await store.search(1, "pe")
+
+    results = asyncio.run(run())
+
+    assert [(number, record.name) for number, record in results] == [(2, "Percival"), (3, "Pelor")]
+    assert results[0][1].last_played == played.timestamp()
+
+
+def test_concurrent_misses_share_one_load_and_keep_upserts():
+    class SlowLoader(Loader):
+        async def __call__(self, user_id):
+            rows = await super().__call__(user_id)
+            await asyncio.sleep(0.01)
+            return rows
+
+    loader = SlowLoader()
+    store = CharacterStore(loader)
+
+    async def run():
+        first = asyncio.create_task(store.characters(1))
+        await asyncio.sleep(0)
+        await store.upsert(1, CharacterRecord.from_url("https://www.dndbeyond.com/characters/333", "Grog"))
+        await first
+        return await store.characters(1)
+
+    characters = asyncio.run(run())
+
+    assert loader.calls == [1]
+    assert [record.name for record in characters] == ["Vex", "Pike", "Grog"]
+    assert store.stats["coalesced"] == 1
@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from cogs.characters import Characters
+from utils import async_db
+from utils.character_store import CharacterStore
+
+
+class FakeMessage:
+    def __init__(self, content, user_id=1):
+        self.content = content
+        self.author = SimpleNamespace(id=user_id, bot=False, display_name="Player")
+        self.replies = []
+
+    async def reply(self, *args, **kwargs):
+        self.replies.append((args, kwargs))
+
+
+@pytest.fixture
+def cog(monkeypatch):
+    async def noop(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(async_db, "save_character", noop)
+    monkeypatch.setattr(async_db, "set_character_selection", noop)
+
+    async def no_characters(user_id):
+        return []
+
+    cog = Characters(SimpleNamespace())
+    cog.characters = CharacterStore(no_characters)
+    cog.fetches = 0
+
+    async def fetch(character_id, **kwargs):
+        cog.fetches += 1
+        return "Vex", None
+
+    cog._fetch_character_from_ddb = fetch
+    return cog
+
+
+def test_messages_without_ddb_links_skip_the_regex(cog):
+    asyncio.run(cog.on_message(FakeMessage("see you all on friday")))
+
+    assert cog.link_stats == {"scanned": 1, "matched": 0, "debounced": 0}
+    assert cog.fetches == 0
+
+
+def test_repeated_link_from_same_user_is_debounced(cog):
+    link = "https://www.dndbeyond.com/characters/12345"
+
+    messages = [FakeMessage(link), FakeMessage(f"again: {link}"), FakeMessage(link, user_id=2)]
+
+    async def run():
+        for message in messages:
+            await cog.on_message(message)
+
+    asyncio.run(run())
+
+    assert cog.fetches == 2
+    assert [len(message.replies) for message in messages] == [1, 0, 1]
+    assert messages[0].replies[0][1]["embed"].title == "Character added and set for next session: Vex"
+    assert cog.link_stats == {"scanned": 3, "matched": 3, "debounced": 1}
+
+
+def test_failed_lookup_does_not_debounce_the_retry(cog):
+    link = "https://www.dndbeyond.com/characters/12345"
+    outcomes = [ValueError("missing_data"), ("Vex", None)]
+
+    async def fetch(character_id, **kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    cog._fetch_character_from_ddb = fetch
+    messages = [FakeMessage(link), FakeMessage(link)]
+
+    async def run():
+        for message in messages:
+            await cog.on_message(message)
+
+    asyncio.run(run())
+
+    assert "private or the ID is incorrect" in messages[0].replies[0][0][0]
+    assert messages[1].replies[0][1]["embed"].title == "Character added and set for next session: Vex"
+    assert cog.link_stats["debounced"] == 0
@@ -0,0 +1,90 @@
+import mysql.connector
+import pytest
+from mysql.connector.errors import PoolError
+
+from utils.db import ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self, *, alive: bool = True):
+        self.alive = alive
+        self.closed = False
+        self.unread_result = False
+        self.in_transaction = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect: bool = False):
+        if not self.alive:
+            raise mysql.connector.errors.InterfaceError("gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(opened: list, **kwargs) -> ConnectionPool:
+    def factory():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    return ConnectionPool(factory, size=kwargs.pop("size", 2), checkout_timeout=kwargs.pop("checkout_timeout", 0.05), **kwargs)
+
+
+def test_pool_reuses_released_connections():
+    opened = []
+    pool = _pool(opened)
+
+    first = pool.acquire()
+    first.close()
+    second = pool.acquire()
+    second.close()
+
+    assert len(opened) == 1
+    stats = pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["opened"] == 1
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 1
+
+
+def test_pool_checkout_times_out_when_exhausted():
+    opened = []
+    pool = _pool(opened, size=1)
+
+    held = pool.acquire()
+    with pytest.raises(PoolError):
+        pool.acquire()
+    held.close()
+
+    assert pool.stats()["timeouts"] == 1
+    pool.acquire().close()
+
+
+def test_pool_replaces_stale_connection_after_failed_ping():
+    opened = []
+    pool = _pool(opened, ping_after=0)
+
+    conn = pool.acquire()
+    conn.close()
+    opened[0].alive = False
+
+    pool.acquire().close()
+
+    assert len(opened) == 2
+    assert opened[0].closed
+    assert pool.stats()["reconnects"] == 1
+
+
+def test_pool_rolls_back_open_transaction_on_release():
+    opened = []
+    pool = _pool(opened)
+
+    conn = pool.acquire()
+    opened[0].in_transaction = True
+    conn.close()
+
+    assert opened[0].rollbacks == 1
@@ -0,0 +1,146 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from utils.ddb_client import DDBClient
+
+
+class FakeDDBClient(DDBClient):
+    def __init__(self, responses, **kwargs):
+        super().__init__(**kwargs)
+        self.responses = responses
+        self.requests = 0
+
+    async def _request_json(self, character_id):
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        response = self.responses[character_id]
+        if isinstance(response, int):
+            raise aiohttp.ClientResponseError(None, (), status=response, message="refused")
+        return response
+
+
+def _character(name):
+    return {"data": {"name": name, "decorations": {"avatarUrl": "https://example.com/a.png"}}}
+
+
+def test_repeated_lookups_hit_the_cache():
+    client = FakeDDBClient({"1": _character("Vex")})
+
+    async def run():
+        first = await client.get_character("1")
+        second = await client.get_character("1")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert first.name == "Vex"
+    assert client.requests == 1
+    assert client.stats["hits"] == 1
+
+
+def test_concurrent_lookups_share_one_request():
+    client = FakeDDBClient({"1": _character("Vex")})
+
+    async def run():
+        return await asyncio.gather(*(client.get_character("1") for _ in range(4)))
+
+    asyncio.run(run())
+
+    assert client.requests == 1
+    assert client.stats["coalesced"] == 3
+
+
+def test_private_sheet_is_negatively_cached_unless_retried():
+    client = FakeDDBClient({"1": 403})
+
+    async def lookup(**kwargs):
+        with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+            await client.get_character("1", **kwargs)
+        return excinfo.value.status
+
+    async def run():
+        statuses = [await lookup(), await lookup()]
+        client.responses["1"] = _character("Vex")
+        return statuses, await client.get_character("1", refresh=True)
+
+    statuses, character = asyncio.run(run())
+
+    assert statuses == [403, 403]
+    assert client.stats["negative_hits"] == 1
+    assert character.name == "Vex"
+    assert client.requests == 2
+
+
+def test_expired_entries_are_refetched():
+    client = FakeDDBClient({"1": _character("Vex")}, ttl=0)
+
+    async def run():
+        await client.get_character("1")
+        await client.get_character("1")
+
+    asyncio.run(run())
+
+    assert client.requests == 2
+
+
+def test_missing_data_raises_value_error():
+    client = FakeDDBClient({"1": {}})
+
+    with pytest.raises(ValueError, match="missing_data"):
+        asyncio.run(client.get_character("1"))
+
+
+def test_conditional_refresh_returns_none_when_unchanged():
+    client = DDBClient()
+    sent = []
+
+    async def request(character_id, etag):
+        sent.append(etag)
+        if etag == '"v1"':
+            return 304, etag, None
+        return 200, '"v1"', _character("Vex")
+
+    client._request_conditional = request
+
+    async def run():
+        fresh = await client.refresh_character("1")
+        unchanged = await client.refresh_character("1", fresh[1])
+        cached = await client.get_character("1")
+        return fresh, unchanged, cached
+
+    fresh, unchanged, cached = asyncio.run(run())
+
+    assert fresh[0].name == "Vex" and fresh[1] == '"v1"'
+    assert unchanged == (None, '"v1"')
+    assert cached is fresh[0]
+    assert sent == [None, '"v1"']
+
+
+def test_refresh_bypasses_a_cached_character():
+    client = FakeDDBClient({"1": _character("Vex")})
+
+    async def run():
+        await client.get_character("1")
+        client.responses["1"] = _character("Vex'ahlia")
+        return await client.get_character("1"), await client.get_character("1", refresh=True)
+
+    cached, refreshed = asyncio.run(run())
+
+    assert cached.name == "Vex"
+    assert refreshed.name == "Vex'ahlia"
+    assert client.requests == 2
+
+
+def test_cache_is_bounded():
+    client = FakeDDBClient({str(i): _character(f"C{i}") for i in range(5)}, max_entries=3)
+
+    async def run():
+        for i in range(5):
+            await client.get_character(str(i))
+
+    asyncio.run(run())
+
+    assert list(client._cache) == ["2", "3", "4"]
@@ -0,0 +1,113 @@
+import asyncio
+import pickle
+from datetime import datetime, timezone
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from utils import feed_fetch
+from utils.feed_fetch import content_fingerprint, normalize_link, parse_feed
+
+ATOM = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Test feed</title>
+  <id>urn:test</id>
+  <updated>2026-06-01T12:00:00Z</updated>
+  <entry>
+    <id>urn:test:1</id>
+    <title>First post</title>
+    <link href="https://example.com/1"/>
+    <updated>2026-06-01T12:00:00Z</updated>
+    <summary type="html">&lt;p&gt;Hello &lt;b&gt;world&lt;/b&gt;&lt;/p&gt;</summary>
+  </entry>
+</feed>
+"""
+
+
+def test_parse_feed_returns_compact_records():
+    entries, error = parse_feed(ATOM.encode(), {"content-type": "application/atom+xml"})
+
+    assert error is None
+    [entry] = entries
+    assert entry.entry_id == "urn:test:1"
+    assert entry.link == "https://example.com/1"
+    assert entry.summary == "Hello world"
+    assert entry.timestamp == datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+    assert pickle.loads(pickle.dumps(entries)) == entries
+
+
+def test_parse_feed_reports_unparseable_feed():
+    entries, error = parse_feed(b"<not a feed", {})
+
+    assert entries == ()
+    assert error
+
+
+async def _serve(handler):
+    app = web.Application()
+    app.router.add_get("/feed", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/feed"
+
+
+def test_fetch_downloads_then_parses_in_worker_and_honours_etag():
+    async def handler(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text=ATOM, content_type="application/atom+xml", headers={"ETag": '"v1"'})
+
+    async def run():
+        runner, url = await _serve(handler)
+        try:
+            first = await feed_fetch.fetch(url)
+            second = await feed_fetch.fetch(url, first.etag)
+        finally:
+            await feed_fetch.shutdown()
+            await runner.cleanup()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first.status == 200
+    assert first.etag == '"v1"'
+    assert [entry.title for entry in first.entries] == ["First post"]
+    assert second.status == 304
+    assert second.entries == ()
+
+
+def test_fetch_gives_up_on_a_stalled_host(monkeypatch):
+    monkeypatch.setattr(feed_fetch, "FETCH_TIMEOUT", aiohttp.ClientTimeout(total=0.2))
+
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.Response(text=ATOM)
+
+    async def run():
+        runner, url = await _serve(handler)
+        try:
+            await feed_fetch.fetch(url)
+        finally:
+            await feed_fetch.shutdown()
+            await runner.cleanup()
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(run())
+
+
+def test_normalize_link_drops_tracking_and_cosmetic_differences():
+    assert normalize_link("http://www.DMsGuild.com/product/123/?utm_source=rss&affiliate_id=9#reviews") == \
+        "https://dmsguild.com/product/123"
+    assert normalize_link("https://example.com/a?b=2&a=1") == "https://example.com/a?a=1&b=2"
+
+
+def test_content_fingerprint_matches_across_feeds():
+    first = content_fingerprint("https://www.dmsguild.com/product/123?utm_medium=feed", "CCC-GHC-01  Lost Tales")
+    second = content_fingerprint("http://dmsguild.com/product/123/", "ccc-ghc-01 lost tales")
+
+    assert first == second
+    assert first != content_fingerprint("https://dmsguild.com/product/124", "CCC-GHC-01 Lost Tales")
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from utils.feed_schedule import (
+    CatchUpPolicy,
+    DEFAULT_POLL_INTERVAL,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    UNCHANGED_BACKOFF,
+    cache_lifetime,
+    compute_poll_interval,
+    plan_catch_up,
+    publish_cadence,
+    spread_overdue,
+    with_jitter,
+)
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_publish_cadence_is_median_gap_of_recent_entries():
+    timestamps = [NOW - timedelta(hours=h) for h in (0, 2, 4, 10)]
+
+    assert publish_cadence(timestamps) == timedelta(hours=2)
+    assert publish_cadence([NOW]) is None
+
+
+def test_cache_lifetime_from_max_age_or_expires():
+    assert cache_lifetime({"Cache-Control": "public, max-age=1800"}, NOW) == timedelta(minutes=30)
+    assert cache_lifetime({"expires": "Mon, 01 Jun 2026 13:00:00 GMT"}, NOW) == timedelta(hours=1)
+    assert cache_lifetime({"expires": "not a date"}, NOW) is None
+    assert cache_lifetime({}, NOW) is None
+
+
+def test_interval_follows_cadence_within_bounds():
+    assert compute_poll_interval(None, cadence=timedelta(hours=4)) == timedelta(hours=2)
+    assert compute_poll_interval(None, cadence=timedelta(minutes=2)) == MIN_POLL_INTERVAL
+    assert compute_poll_interval(None, cadence=timedelta(days=30)) == MAX_POLL_INTERVAL
+
+
+def test_interval_backs_off_when_unchanged_and_honours_cache_lifetime():
+    assert compute_poll_interval(None, changed=False) == DEFAULT_POLL_INTERVAL * UNCHANGED_BACKOFF
+    assert compute_poll_interval(timedelta(hours=1), changed=True) == timedelta(hours=1)
+    assert compute_poll_interval(
+        timedelta(minutes=20), cadence=timedelta(minutes=20), cache_for=timedelta(hours=3)
+    ) == timedelta(hours=3)
+
+
+def test_with_jitter_stays_within_fraction():
+    interval = timedelta(hours=1)
+
+    assert with_jitter(interval, 0.1, rng=lambda: 0.0) == timedelta(minutes=54)
+    assert with_jitter(interval, 0.1, rng=lambda: 1.0) == timedelta(minutes=66)
+
+
+def test_spread_overdue_spaces_feeds_across_window():
+    due = spread_overdue(4, NOW, timedelta(minutes=10))
+
+    assert due == [NOW + timedelta(minutes=2.5) * i for i in range(4)]
+    assert spread_overdue(0, NOW, timedelta(minutes=10)) == []
+
+
+def _entries(*hours_ago):
+    return [SimpleNamespace(name=f"{h}h", timestamp=NOW - timedelta(hours=h)) for h in hours_ago]
+
+
+def _names(entries):
+    return [entry.name for entry in entries]
+
+
+def test_plan_catch_up_caps_posts_and_defers_the_rest():
+    plan = plan_catch_up(_entries(6, 5, 4, 3, 2, 1), CatchUpPolicy(max_per_cycle=4), NOW)
+
+    assert _names(plan.post) == ["6h", "5h", "4h", "3h"]
+    assert _names(plan.defer) == ["2h", "1h"]
+    assert plan.skip == []
+
+
+def test_plan_catch_up_skips_entries_older_than_max_age():
+    plan = plan_catch_up(_entries(48, 2), CatchUpPolicy(max_age=timedelta(days=1)), NOW, overdue=timedelta(hours=8))
+
+    assert _names(plan.skip) == ["48h"]
+    assert _names(plan.post) == ["2h"]
+
+
+def test_plan_catch_up_posts_backdated_entries_when_not_catching_up():
+    plan = plan_catch_up(_entries(240), CatchUpPolicy(), NOW, overdue=timedelta(minutes=1))
+
+    assert _names(plan.post) == ["240h"]
+    assert plan.skip == []
+
+
+def test_plan_catch_up_posts_a_full_message_of_entries_per_cycle():
+    plan = plan_catch_up(_entries(*range(12, 0, -1)), CatchUpPolicy(), NOW)
+
+    assert len(plan.post) == 10
+    assert len(plan.defer) == 2
+
+
+def test_plan_catch_up_first_run_backfills_newest_only():
+    entries = _entries(4, 3, 2, 1)
+
+    assert _names(plan_catch_up(entries, CatchUpPolicy(), NOW, first_run=True).skip) == ["4h", "3h", "2h", "1h"]
+    plan = plan_catch_up(entries, CatchUpPolicy(backfill=2), NOW, first_run=True)
+    assert _names(plan.post) == ["2h", "1h"]
+    assert _names(plan.skip) == ["4h", "3h"]
+
+
+def test_plan_catch_up_posts_whole_burst_when_it_becomes_a_digest():
+    plan = plan_catch_up(_entries(*range(12, 0, -1)), CatchUpPolicy(max_per_cycle=5), NOW, digest_threshold=10)
+
+    assert len(plan.post) == 12
+    assert plan.defer == []
+
+
+def test_catch_up_policy_for_feed_applies_overrides():
+    policy = CatchUpPolicy.for_feed({"catch_up_max_per_cycle": 2, "catch_up_max_age_hours": 12, "backfill_count": 3})
+
+    assert policy == CatchUpPolicy(max_per_cycle=2, max_age=timedelta(hours=12), backfill=3)
+    assert CatchUpPolicy.for_feed({}) == CatchUpPolicy()
@@ -1,6 +1,10 @@
+import asyncio
 from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
 from zoneinfo import ZoneInfo
 
+from cogs.sessions import Sessions
+from utils import async_db
 from utils.session_format import build_gotime_embed, format_player_lines
 from utils.warhorn_api import find_current_session, format_obs_copy, OBS_TITLE_PREFIX
 
@@ -120,3 +124,23 @@ def test_format_player_lines_marks_unknown_characters():
 
     assert lines == ["• Bob → Unknown"]
     assert unknown == ["Bob"]
+
+
+def test_collect_voice_players_looks_up_selections_in_one_query(monkeypatch):
+    calls = []
+
+    async def selections(user_ids):
+        calls.append(list(user_ids))
+        return {1: {"character_url": "https://www.dndbeyond.com/characters/1", "character_name": "Vex"}}
+
+    monkeypatch.setattr(async_db, "get_character_selections", selections)
+    channel = SimpleNamespace(members=[
+        SimpleNamespace(id=1, bot=False, display_name="Laura"),
+        SimpleNamespace(id=2, bot=True, display_name="Bot"),
+        SimpleNamespace(id=3, bot=False, display_name="Travis"),
+    ])
+
+    players = asyncio.run(Sessions._collect_voice_players(channel))
+
+    assert calls == [[1, 3]]
+    assert [(player["user_id"], player["character_name"]) for player in players] == [(1, "Vex"), (3, None)]
@@ -0,0 +1,22 @@
+import asyncio
+
+from utils.http_session import PooledSession
+
+
+def test_pooled_session_is_reused_until_closed():
+    pooled = PooledSession(headers={"User-Agent": "test"}, max_connections=2)
+
+    async def run():
+        first = pooled.get()
+        same = pooled.get()
+        await pooled.close()
+        second = pooled.get()
+        await pooled.close()
+        return first, same, second
+
+    first, same, second = asyncio.run(run())
+
+    assert first is same
+    assert first.closed
+    assert second is not first
+    assert first.connector is None or first.connector.closed
@@ -0,0 +1,39 @@
+import discord
+
+from cogs.rss import pack_embeds
+from utils import db
+
+
+def test_pack_embeds_caps_count_per_message():
+    embeds = [discord.Embed(title=f"Post {i}") for i in range(23)]
+
+    batches = pack_embeds(embeds)
+
+    assert [len(batch) for batch in batches] == [10, 10, 3]
+    assert [embed for batch in batches for embed in batch] == embeds
+
+
+def test_pack_embeds_respects_total_character_limit():
+    embeds = [discord.Embed(title="x" * 100, description="y" * 2000) for _ in range(5)]
+
+    batches = pack_embeds(embeds)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert all(sum(len(embed) for embed in batch) <= 6000 for batch in batches)
+
+
+def test_entry_hash_is_fixed_width_and_distinguishes_long_shared_prefixes():
+    prefix = "tag:dmsguild.com,2026:product/" + "x" * 300
+    first, second = db.entry_hash(prefix + "1"), db.entry_hash(prefix + "2")
+
+    assert len(first) == len(second) == 64
+    assert first != second
+
+
+def test_long_ids_seen_before_the_hash_migration_stay_seen():
+    long_id = "tag:dmsguild.com,2026:product/" + "x" * 300
+    legacy = {db.entry_hash(long_id[:db.LEGACY_ENTRY_ID_LENGTH])}
+
+    assert db.is_entry_seen(long_id, legacy)
+    assert db.is_entry_seen("short", {db.entry_hash("short")})
+    assert not db.is_entry_seen(long_id + "2", {db.entry_hash(long_id)})
@@ -0,0 +1,92 @@
+from datetime import datetime, timezone
+
+from utils.schedule_diff import (
+    SEAT_OPENED,
+    SESSION_ADDED,
+    SESSION_REMOVED,
+    SESSION_RESCHEDULED,
+    TRUNCATED_SUFFIX,
+    WAITLIST_MOVED,
+    diff_schedules,
+    format_schedule_changes,
+)
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _session(session_id="1", **overrides) -> dict:
+    session = {
+        "id": session_id,
+        "name": f"Game {session_id}",
+        "startsAt": "2026-06-10T23:00:00Z",
+        "availablePlayerSeats": 2,
+        "playerSignups": [{"user": {"name": "alice"}}],
+        "playerWaitlistEntries": [],
+    }
+    session.update(overrides)
+    return session
+
+
+def _kinds(changes) -> list[str]:
+    return [change.kind for change in changes]
+
+
+def test_identical_schedules_have_no_changes():
+    assert diff_schedules([_session()], [_session()], NOW) == []
+
+
+def test_seat_count_changes_while_open_are_not_meaningful():
+    assert diff_schedules([_session(availablePlayerSeats=3)], [_session(availablePlayerSeats=1)], NOW) == []
+
+
+def test_added_and_rescheduled_sessions():
+    old = [_session("1")]
+    new = [_session("1", startsAt="2026-06-11T23:00:00Z"), _session("2", startsAt="2026-06-12T23:00:00Z")]
+
+    changes = diff_schedules(old, new, NOW)
+
+    assert _kinds(changes) == [SESSION_RESCHEDULED, SESSION_ADDED]
+    assert changes[0].previous["startsAt"] == "2026-06-10T23:00:00Z"
+
+
+def test_removed_only_reported_for_future_sessions():
+    future = _session("1")
+    started = _session("2", startsAt="2026-06-01T11:00:00Z")
+
+    changes = diff_schedules([future, started], [], NOW)
+
+    assert _kinds(changes) == [SESSION_REMOVED]
+    assert changes[0].session["id"] == "1"
+
+
+def test_seat_opened_and_waitlist_promotion():
+    old = [_session(availablePlayerSeats=0, playerWaitlistEntries=[{"user": {"name": "bob"}}])]
+    new = [_session(availablePlayerSeats=1, playerSignups=[{"user": {"name": "alice"}}, {"user": {"name": "bob"}}])]
+
+    changes = diff_schedules(old, new, NOW)
+
+    assert sorted(_kinds(changes)) == sorted([SEAT_OPENED, WAITLIST_MOVED])
+    assert next(c for c in changes if c.kind == WAITLIST_MOVED).names == ("bob",)
+
+
+def test_format_schedule_changes_is_one_line_per_change():
+    changes = diff_schedules([], [_session("1"), _session("2")], NOW)
+
+    text = format_schedule_changes(changes)
+
+    assert text.count("\n") == 1
+    assert "*Game 1* was added" in text
+
+
+def test_format_schedule_changes_truncates_at_a_line_or_hard():
+    changes = diff_schedules([], [_session(str(i)) for i in range(50)], NOW)
+    full = format_schedule_changes(changes)
+
+    text = format_schedule_changes(changes, limit=500)
+    assert len(text) <= 500
+    assert full.startswith(text.removesuffix(TRUNCATED_SUFFIX) + "\n")
+
+    long_name = diff_schedules([], [_session("1", name="x" * 600)], NOW)
+    text = format_schedule_changes(long_name, limit=500)
+    assert len(text) == 500
+    assert text.endswith(TRUNCATED_SUFFIX)
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from utils.schedule_format import build_schedule_embed, format_player_name, schedule_digest, with_as_of
+
+
+def _session(**overrides) -> dict:
+    session = {
+        "id": "1",
+        "uuid": "abc-123",
+        "name": "Absent without Leave",
+        "startsAt": "2026-06-10T23:00:00Z",
+        "availablePlayerSeats": 2,
+        "gmSignups": [{"user": {"name": "Dan"}}],
+        "playerSignups": [{"user": {"name": "alice99 (Alice)"}}, {"user": {"name": "bob"}}],
+        "playerWaitlistEntries": [],
+    }
+    session.update(overrides)
+    return session
+
+
+def test_format_player_name_swaps_real_name_first():
+    assert format_player_name("alice99 (Alice)") == "Alice (alice99)"
+    assert format_player_name("bob") == "bob"
+
+
+def test_build_schedule_embed_lists_sessions_with_links_and_status():
+    embed = build_schedule_embed([_session()])
+
+    assert embed.title == "Upcoming Warhorn Events"
+    assert "[Absent without Leave](https://warhorn.net/events/pandodnd/schedule/sessions/abc-123)" in embed.description
+    assert "Alice (alice99), bob" in embed.description
+    assert "2 slots available!" in embed.description
+    assert f"<t:{int(datetime(2026, 6, 10, 23, 0, tzinfo=timezone.utc).timestamp())}:F>" in embed.description
+
+
+def test_build_schedule_embed_shows_waitlist_when_full():
+    session = _session(availablePlayerSeats=0, playerWaitlistEntries=[{"user": {"name": "Carol"}}])
+
+    embed = build_schedule_embed([session])
+
+    assert "**Waitlist:** Carol" in embed.description
+
+
+def test_build_schedule_embed_without_sessions():
+    embed = build_schedule_embed([])
+
+    assert embed.description == "No upcoming sessions found."
+
+
+def test_with_as_of_stamps_a_copy():
+    embed = build_schedule_embed([_session()])
+    fetched_at = datetime(2026, 6, 10, 12, 0, tzinfo=timezone.utc)
+
+    stamped = with_as_of(embed, fetched_at)
+
+    assert stamped.description.endswith(f"*As of <t:{int(fetched_at.timestamp())}:R>*")
+    assert "As of" not in embed.description
+
+
+def test_schedule_digest_is_stable_and_ignores_unrendered_fields():
+    session = _session()
+    reordered = dict(reversed(list(session.items())))
+    with_extra = _session(gameSystem="D&D 5e")
+
+    assert schedule_digest([session]) == schedule_digest([reordered])
+    assert schedule_digest([session]) == schedule_digest([with_extra])
+    assert len(schedule_digest([session])) == 64
+
+
+def test_schedule_digest_changes_with_seats_and_rendering():
+    session = _session()
+    embed = build_schedule_embed([session])
+
+    assert schedule_digest([session]) != schedule_digest([_session(availablePlayerSeats=1)])
+    assert schedule_digest([session], embed) != schedule_digest([session], with_as_of(embed, datetime.now(timezone.utc)))
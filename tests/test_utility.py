@@ -0,0 +1,25 @@
+from types import SimpleNamespace
+
+from cogs.utility import Utility, format_stats
+from utils import db
+
+
+def test_format_stats_rounds_floats():
+    assert format_stats("db pool", {"checkouts": 3, "wait_ms_avg": 1.25}) == "db pool: checkouts=3, wait_ms_avg=1.2"
+
+
+def test_collect_stats_reports_every_component(monkeypatch):
+    monkeypatch.setattr(db, "pool_stats", lambda: {"checkouts": 1})
+    characters = SimpleNamespace(
+        ddb=SimpleNamespace(stats={"hits": 2}),
+        characters=SimpleNamespace(stats={"misses": 3}),
+        link_stats={"scanned": 4},
+    )
+    bot = SimpleNamespace(
+        warhorn_snapshots=SimpleNamespace(stats={"fetches": 5}),
+        get_cog=lambda name: characters if name == "Characters" else None,
+    )
+
+    labels = [label for label, _ in Utility(bot)._collect_stats()]
+
+    assert labels == ["db pool", "warhorn", "ddb", "character cache", "character links"]
@@ -0,0 +1,132 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from cogs.warhorn import SUBSCRIBER_MAX_FAILURES, Warhorn
+from utils import async_db
+
+
+class FakeResponse:
+    status = 403
+    reason = "Forbidden"
+
+
+class FakeDMChannel:
+    def __init__(self, user_id, forbidden=False):
+        self.user_id = user_id
+        self.forbidden = forbidden
+        self.sent = []
+
+    async def send(self, embed=None):
+        if self.forbidden:
+            raise discord.Forbidden(FakeResponse(), "Cannot send messages to this user")
+        self.sent.append(embed)
+
+
+class FakeUser:
+    def __init__(self, user_id, forbidden=False):
+        self.dm_channel = None
+        self.channel = FakeDMChannel(user_id, forbidden)
+        self.create_dm_calls = 0
+
+    async def create_dm(self):
+        self.create_dm_calls += 1
+        self.dm_channel = self.channel
+        return self.channel
+
+
+class FakeBot:
+    warhorn_snapshots = None
+
+    def __init__(self, cached, remote):
+        self.cached = cached
+        self.remote = remote
+        self.fetch_calls = 0
+
+    def get_user(self, user_id):
+        return self.cached.get(user_id)
+
+    async def fetch_user(self, user_id):
+        self.fetch_calls += 1
+        return self.remote[user_id]
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = {"reset": [], "failed": []}
+
+    async def reset(user_ids):
+        calls["reset"].extend(user_ids)
+
+    async def failed(user_ids):
+        calls["failed"].extend(user_ids)
+
+    monkeypatch.setattr(async_db, "reset_subscriber_failures", reset)
+    monkeypatch.setattr(async_db, "record_subscriber_failures", failed)
+    return calls
+
+
+def test_deliver_dms_prefers_cache_and_records_failures(recorded):
+    cached = {1: FakeUser(1)}
+    remote = {2: FakeUser(2), 3: FakeUser(3, forbidden=True)}
+    bot = FakeBot(cached, remote)
+    cog = Warhorn(bot)
+    embed = discord.Embed(title="update")
+
+    asyncio.run(cog._deliver_dms([1, 2, 3], embed, "test"))
+
+    assert bot.fetch_calls == 2
+    assert cached[1].channel.sent == [embed]
+    assert remote[2].channel.sent == [embed]
+    assert sorted(recorded["reset"]) == [1, 2]
+    assert recorded["failed"] == [3]
+
+
+def test_deliver_dms_reuses_dm_channels(recorded):
+    user = FakeUser(1)
+    bot = FakeBot({}, {1: user})
+    cog = Warhorn(bot)
+
+    async def run():
+        await cog._deliver_dms([1], discord.Embed(title="a"), "test")
+        await cog._deliver_dms([1], discord.Embed(title="b"), "test")
+
+    asyncio.run(run())
+
+    assert bot.fetch_calls == 1
+    assert user.create_dm_calls == 1
+    assert len(user.channel.sent) == 2
+
+
+class FakeInteractionResponse:
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, content, **kwargs):
+        self.messages.append(content)
+
+
+def test_notify_resumes_a_skipped_subscriber_instead_of_unsubscribing(monkeypatch):
+    calls = []
+
+    async def failure_count(user_id):
+        return SUBSCRIBER_MAX_FAILURES
+
+    async def add(user_id):
+        calls.append(("add", user_id))
+
+    async def remove(user_id):
+        calls.append(("remove", user_id))
+
+    monkeypatch.setattr(async_db, "get_subscriber_failure_count", failure_count)
+    monkeypatch.setattr(async_db, "add_subscriber", add)
+    monkeypatch.setattr(async_db, "remove_subscriber", remove)
+    cog = Warhorn(FakeBot({}, {}))
+    interaction = SimpleNamespace(user=SimpleNamespace(id=7), response=FakeInteractionResponse())
+
+    asyncio.run(cog.notify.callback(cog, interaction))
+
+    assert calls == [("add", 7)]
+    assert "paused" in interaction.response.messages[0]
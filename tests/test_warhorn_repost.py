@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from cogs.warhorn import WATCH_UPDATE_CONCURRENCY, Warhorn
+from utils import async_db
+
+
+class FakeChannel:
+    def __init__(self, message_ids):
+        self.id = 10
+        self.message_ids = message_ids
+        self.history_calls = 0
+
+    async def history(self, limit):
+        self.history_calls += 1
+        for message_id in sorted(self.message_ids, reverse=True)[:limit]:
+            yield SimpleNamespace(id=message_id)
+
+
+def _cog():
+    return Warhorn(SimpleNamespace(warhorn_snapshots=None))
+
+
+def test_deleting_chat_under_the_schedule_unburies_it():
+    cog = _cog()
+    channel = FakeChannel({100, 101})
+    schedule = SimpleNamespace(id=100, channel=channel)
+    cog._note_channel_activity(channel.id, 101)
+
+    async def run():
+        buried_before = await cog._is_buried(channel.id, schedule)
+        channel.message_ids.discard(101)
+        await cog.on_raw_message_delete(SimpleNamespace(channel_id=channel.id, message_id=101))
+        return buried_before, await cog._is_buried(channel.id, schedule), await cog._is_buried(channel.id, schedule)
+
+    buried_before, buried_after, buried_again = asyncio.run(run())
+
+    assert buried_before is True
+    assert buried_after is buried_again is False
+    assert channel.history_calls == 1
+
+
+def test_deleting_older_chat_needs_no_history_call():
+    cog = _cog()
+    channel = FakeChannel({100, 101, 102})
+    schedule = SimpleNamespace(id=100, channel=channel)
+    cog._note_channel_activity(channel.id, 102)
+
+    async def run():
+        await cog.on_raw_bulk_message_delete(SimpleNamespace(channel_id=channel.id, message_ids={101}))
+        return await cog._is_buried(channel.id, schedule)
+
+    assert asyncio.run(run()) is True
+    assert channel.history_calls == 0
+
+
+class FakeHTTPResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "error"
+
+
+class FakeScheduleMessage(discord.Message):
+    def __init__(self, message_id, tracker, *, delay=0.0, error=None):
+        self.id = message_id
+        self.channel = SimpleNamespace(id=message_id, name=f"channel-{message_id}")
+        self.tracker = tracker
+        self.delay = delay
+        self.error = error
+
+    async def edit(self, embed=None):
+        self.tracker["in_flight"] += 1
+        self.tracker["max_in_flight"] = max(self.tracker["max_in_flight"], self.tracker["in_flight"])
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            self.tracker["edited"].append(self.id)
+        finally:
+            self.tracker["in_flight"] -= 1
+
+
+def test_watched_channels_update_concurrently_and_report_dead_channels(monkeypatch):
+    async def save_hash(channel_id, schedule_hash):
+        return None
+
+    monkeypatch.setattr(async_db, "save_schedule_hash", save_hash)
+    tracker = {"in_flight": 0, "max_in_flight": 0, "edited": []}
+    messages = {
+        1: FakeScheduleMessage(1, tracker, delay=0.2),
+        2: FakeScheduleMessage(2, tracker, error=RuntimeError("boom")),
+        3: FakeScheduleMessage(3, tracker, error=discord.NotFound(FakeHTTPResponse(404), "gone")),
+        4: FakeScheduleMessage(4, tracker, error=discord.Forbidden(FakeHTTPResponse(403), "no access")),
+    }
+    messages.update({i: FakeScheduleMessage(i, tracker, delay=0.01) for i in range(5, 12)})
+    cog = _cog()
+    cog.watched_schedules = dict(messages)
+
+    removed = asyncio.run(cog._update_watched_channels(list(messages), discord.Embed(title="schedule"), "hash"))
+
+    assert sorted(removed) == [3, 4]
+    assert tracker["max_in_flight"] == WATCH_UPDATE_CONCURRENCY
+    # The slow channel holds one slot; everyone else is done before it finishes.
+    assert tracker["edited"][-1] == 1
+    assert sorted(tracker["edited"]) == [1, *range(5, 12)]
+    assert cog.schedule_hashes[5] == "hash"
+    assert 2 not in cog.schedule_hashes
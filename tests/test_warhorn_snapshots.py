@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utils import async_db
+from utils.warhorn_snapshots import WarhornSnapshot, WarhornSnapshotService
+
+
+def _iso(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class FakeClient:
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.calls = 0
+
+    async def get_sessions_for_gotime(self, event_slug, now=None):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"data": {"eventSessions": {"nodes": self.nodes}}}
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _no_db(monkeypatch):
+    async def record(nodes):
+        return None
+
+    monkeypatch.setattr(async_db, "record_warhorn_sessions", record)
+
+
+def test_concurrent_callers_share_one_fetch():
+    now = datetime.now(timezone.utc)
+    client = FakeClient([{"id": "1", "name": "Game", "startsAt": _iso(now + timedelta(days=1))}])
+    service = WarhornSnapshotService(client, "pandodnd")
+
+    async def run():
+        return await asyncio.gather(*(service.get() for _ in range(5)))
+
+    snapshots = asyncio.run(run())
+
+    assert client.calls == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert service.stats["coalesced"] == 4
+
+
+def test_get_answers_from_memory_within_ttl_and_refetches_when_stale():
+    client = FakeClient([])
+    service = WarhornSnapshotService(client, "pandodnd", ttl=timedelta(minutes=5))
+
+    async def run():
+        await service.get()
+        await service.get()
+        await service.get(max_age=timedelta(0))
+
+    asyncio.run(run())
+
+    assert client.calls == 2
+    assert service.stats["hits"] == 1
+
+
+def test_unexpected_response_raises_value_error():
+    class BrokenClient(FakeClient):
+        async def get_sessions_for_gotime(self, event_slug, now=None):
+            return {"errors": ["nope"]}
+
+    service = WarhornSnapshotService(BrokenClient([]), "pandodnd")
+
+    with pytest.raises(ValueError):
+        asyncio.run(service.get())
+    assert service.latest is None
+
+
+def test_snapshot_upcoming_excludes_started_sessions():
+    now = datetime(2026, 6, 10, 23, 0, tzinfo=timezone.utc)
+    snapshot = WarhornSnapshot(
+        [
+            {"id": "1", "startsAt": _iso(now - timedelta(hours=1))},
+            {"id": "2", "startsAt": _iso(now + timedelta(hours=1))},
+        ],
+        fetched_at=now,
+    )
+
+    assert [s["id"] for s in snapshot.upcoming(now)] == ["2"]
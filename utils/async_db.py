@@ -0,0 +1,110 @@
+"""Awaitable versions of the utils.db helpers for use from cogs.
+
+Each call runs the blocking helper on a dedicated thread pool sized to the
+connection pool, so MySQL round trips never stall the discord.py event loop
+and a worker thread never has to wait for a free connection.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import db
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = int(os.getenv("DATABASE_POOL_SIZE", db.DEFAULT_POOL_SIZE))
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db")
+    return _executor
+
+
+async def run(func, *args, **kwargs):
+    """Run any blocking db callable on the database thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _awaitable(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run(func, *args, **kwargs)
+    return wrapper
+
+
+init_schema = _awaitable(db.init_schema)
+migrate_from_json = _awaitable(db.migrate_from_json)
+seed_warhorn_sessions_from_cache = _awaitable(db.seed_warhorn_sessions_from_cache)
+
+# --- Characters ---
+load_user_characters = _awaitable(db.load_user_characters)
+save_character = _awaitable(db.save_character)
+load_characters_to_refresh = _awaitable(db.load_characters_to_refresh)
+save_character_refreshes = _awaitable(db.save_character_refreshes)
+
+# --- Feeds / RSS Seen ---
+load_all_feeds = _awaitable(db.load_all_feeds)
+save_feed_validators = _awaitable(db.save_feed_validators)
+save_feed_schedule = _awaitable(db.save_feed_schedule)
+load_all_seen_hashes = _awaitable(db.load_all_seen_hashes)
+add_seen_hashes = _awaitable(db.add_seen_hashes)
+prune_seen_entries = _awaitable(db.prune_seen_entries)
+load_all_fingerprints = _awaitable(db.load_all_fingerprints)
+add_fingerprints = _awaitable(db.add_fingerprints)
+prune_fingerprints = _awaitable(db.prune_fingerprints)
+
+# --- Watched Schedules / Warhorn Sessions ---
+load_all_watched_schedules = _awaitable(db.load_all_watched_schedules)
+save_watched_schedule = _awaitable(db.save_watched_schedule)
+save_schedule_hash = _awaitable(db.save_schedule_hash)
+remove_watched_schedule = _awaitable(db.remove_watched_schedule)
+record_warhorn_sessions = _awaitable(db.record_warhorn_sessions)
+get_recent_warhorn_sessions = _awaitable(db.get_recent_warhorn_sessions)
+
+# --- Session Character Selections ---
+get_character_selection = _awaitable(db.get_character_selection)
+get_character_selections = _awaitable(db.get_character_selections)
+set_character_selection = _awaitable(db.set_character_selection)
+clear_character_selections = _awaitable(db.clear_character_selections)
+clear_stale_session_selections = _awaitable(db.clear_stale_session_selections)
+
+# --- Sessions ---
+upsert_session = _awaitable(db.upsert_session)
+upsert_session_player = _awaitable(db.upsert_session_player)
+get_rewards_session = _awaitable(db.get_rewards_session)
+get_session_players = _awaitable(db.get_session_players)
+get_rewards_session_players = _awaitable(db.get_rewards_session_players)
+
+# --- Announcement Log ---
+has_announcement_fired = _awaitable(db.has_announcement_fired)
+mark_announcement_fired = _awaitable(db.mark_announcement_fired)
+
+# --- Schedule Subscribers ---
+get_all_subscribers = _awaitable(db.get_all_subscribers)
+get_deliverable_subscribers = _awaitable(db.get_deliverable_subscribers)
+record_subscriber_failures = _awaitable(db.record_subscriber_failures)
+reset_subscriber_failures = _awaitable(db.reset_subscriber_failures)
+is_subscribed = _awaitable(db.is_subscribed)
+get_subscriber_failure_count = _awaitable(db.get_subscriber_failure_count)
+add_subscriber = _awaitable(db.add_subscriber)
+remove_subscriber = _awaitable(db.remove_subscriber)
+
+# --- Adventure Wishlist ---
+add_adventure_wishlist = _awaitable(db.add_adventure_wishlist)
+remove_adventure_wishlist = _awaitable(db.remove_adventure_wishlist)
+get_adventure_wishlist_for_user = _awaitable(db.get_adventure_wishlist_for_user)
+get_adventure_wishlist = _awaitable(db.get_adventure_wishlist)
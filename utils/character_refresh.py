@@ -0,0 +1,62 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from utils.character_store import extract_character_id
+
+CHARACTER_REFRESH_BUDGET = 200
+CHARACTER_REFRESH_CONCURRENCY = 4
+
+
+@dataclass
+class RefreshResult:
+    # Rows to write back, as {url, name, avatar_url, ddb_etag}; includes ETag-only changes.
+    updates: list = field(default_factory=list)
+    # URLs checked without anything to write, failures included so they rotate to the back.
+    checked: list = field(default_factory=list)
+    refreshed: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+
+async def refresh_characters(client, rows: list, concurrency: int = CHARACTER_REFRESH_CONCURRENCY) -> RefreshResult:
+    """Re-fetch saved characters ({url, name, avatar_url, ddb_etag} rows) from D&D Beyond.
+
+    At most `concurrency` requests are in flight, and each sends the stored ETag so an
+    unchanged sheet costs a 304.
+    """
+    result = RefreshResult()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def refresh(row):
+        character_id = extract_character_id(row["url"])
+        if character_id is None:
+            result.failed += 1
+            result.checked.append(row["url"])
+            return
+        try:
+            async with semaphore:
+                character, etag = await client.refresh_character(character_id, row.get("ddb_etag"))
+        except Exception as e:
+            print(f"[Characters] Refresh failed for {row['url']}: {e}")
+            result.failed += 1
+            result.checked.append(row["url"])
+            return
+
+        if character is None:
+            result.unchanged += 1
+            result.checked.append(row["url"])
+            return
+        changed = (character.name, character.avatar_url) != (row["name"], row.get("avatar_url"))
+        if changed:
+            result.refreshed += 1
+        else:
+            result.unchanged += 1
+        if changed or etag != row.get("ddb_etag"):
+            result.updates.append(
+                {"url": row["url"], "name": character.name, "avatar_url": character.avatar_url, "ddb_etag": etag}
+            )
+        else:
+            result.checked.append(row["url"])
+
+    await asyncio.gather(*(refresh(row) for row in rows))
+    return result
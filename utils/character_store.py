@@ -0,0 +1,177 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict
+
+DDB_CHARACTER_ID_RE = re.compile(r"characters/(\d+)")
+NAME_TOKEN_RE = re.compile(r"\w+")
+AUTOCOMPLETE_LIMIT = 25
+CHARACTER_CACHE_SIZE = 500
+CHARACTER_CACHE_TTL_SECONDS = 1800
+
+
+def extract_character_id(text: str) -> str | None:
+    match = DDB_CHARACTER_ID_RE.search(text)
+    return match.group(1) if match else None
+
+
+class CharacterRecord:
+    __slots__ = ("character_id", "url", "name", "avatar_url", "last_played", "folded_name", "name_tokens")
+
+    def __init__(
+        self,
+        character_id: str,
+        url: str,
+        name: str,
+        avatar_url: str | None = None,
+        last_played: float = 0.0,
+    ):
+        self.character_id = character_id
+        self.url = url
+        self.name = name
+        self.avatar_url = avatar_url
+        # Unix time of the last session this character played, 0 if never.
+        self.last_played = last_played
+        # Precomputed for autocomplete, which runs on every keystroke.
+        self.folded_name = (name or "").casefold()
+        self.name_tokens = tuple(NAME_TOKEN_RE.findall(self.folded_name))
+
+    @classmethod
+    def from_url(
+        cls, url: str, name: str, avatar_url: str | None = None, last_played: float = 0.0
+    ) -> "CharacterRecord":
+        # Rows saved before URLs were normalized may not contain an id; key those by URL.
+        return cls(extract_character_id(url) or url, url, name, avatar_url, last_played)
+
+    def match_rank(self, needle: str) -> int | None:
+        """0 for a name prefix, 1 for a word prefix, 2 for a substring, None for no match."""
+        if self.folded_name.startswith(needle):
+            return 0
+        if any(token.startswith(needle) for token in self.name_tokens):
+            return 1
+        if needle in self.folded_name:
+            return 2
+        return None
+
+    def __repr__(self):
+        return f"CharacterRecord({self.character_id!r}, {self.name!r})"
+
+
+class CharacterStore:
+    """Saved characters per user, keyed by D&D Beyond character id, loaded on demand.
+
+    Users are loaded through `loader` (an async callable returning that user's
+    [{url, name, avatar_url, last_played}, ...] rows) the first time they're needed and kept in
+    an LRU of at most `max_users`, each for up to `ttl` seconds. Each user's
+    characters keep the loader's order, first saved first (characters.saved_seq),
+    with new ones appended, so the numbering /character list shows survives reloads.
+    A per-user recency order backs /character play autocomplete.
+    """
+
+    def __init__(
+        self,
+        loader,
+        *,
+        max_users: int = CHARACTER_CACHE_SIZE,
+        ttl: float = CHARACTER_CACHE_TTL_SECONDS,
+    ):
+        self._loader = loader
+        self.max_users = max_users
+        self.ttl = ttl
+        self._by_user: OrderedDict[int, dict[str, CharacterRecord]] = OrderedDict()
+        self._loaded_at: dict[int, float] = {}
+        # Per user: character ids by most recently played, then save order.
+        self._by_recency: dict[int, list[str]] = {}
+        # One load per user at a time; concurrent misses wait on it instead of loading again.
+        self._loading: dict[int, asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._by_user)
+
+    async def characters(self, user_id: int) -> list[CharacterRecord]:
+        return list((await self._user(user_id)).values())
+
+    async def upsert(self, user_id: int, record: CharacterRecord) -> bool:
+        """Add or replace a user's character in place. Returns True if it was new for them."""
+        user_characters = await self._user(user_id)
+        previous = user_characters.get(record.character_id)
+        if previous is not None:
+            record.last_played = max(record.last_played, previous.last_played)
+        user_characters[record.character_id] = record
+        self._rank(user_id)
+        return previous is None
+
+    async def search(self, user_id: int, query: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[tuple[int, CharacterRecord]]:
+        """(number in /character list, record) pairs matching `query` for autocomplete.
+
+        Name prefixes come before word prefixes before substrings; within each, the most
+        recently played character comes first.
+        """
+        user_characters = await self._user(user_id)
+        positions = {character_id: i + 1 for i, character_id in enumerate(user_characters)}
+        needle = query.strip().casefold()
+        buckets: tuple[list, list, list] = ([], [], [])
+        for character_id in self._by_recency.get(user_id, ()):
+            record = user_characters[character_id]
+            rank = record.match_rank(needle)
+            if rank is not None:
+                buckets[rank].append((positions[character_id], record))
+        return (buckets[0] + buckets[1] + buckets[2])[:limit]
+
+    def refresh(self, character_id: str, name: str, avatar_url: str | None):
+        """Apply a background refresh to every cached user who saved this character."""
+        for user_characters in self._by_user.values():
+            previous = user_characters.get(character_id)
+            if previous is not None:
+                user_characters[character_id] = CharacterRecord(
+                    character_id, previous.url, name, avatar_url, previous.last_played
+                )
+
+    async def _user(self, user_id: int) -> dict[str, CharacterRecord]:
+        user_characters = self._by_user.get(user_id)
+        if user_characters is not None and time.monotonic() - self._loaded_at[user_id] < self.ttl:
+            self.stats["hits"] += 1
+            self._by_user.move_to_end(user_id)
+            return user_characters
+
+        task = self._loading.get(user_id)
+        if task is None:
+            self.stats["misses"] += 1
+            task = asyncio.create_task(self._load(user_id))
+            self._loading[user_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(user_id, None))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    async def _load(self, user_id: int) -> dict[str, CharacterRecord]:
+        rows = await self._loader(user_id)
+        self._forget(user_id)
+        user_characters = {}
+        for row in rows:
+            last_played = row.get("last_played")
+            record = CharacterRecord.from_url(
+                row["url"], row["name"], row.get("avatar_url"), last_played.timestamp() if last_played else 0.0
+            )
+            user_characters[record.character_id] = record
+        self._by_user[user_id] = user_characters
+        self._loaded_at[user_id] = time.monotonic()
+        self._rank(user_id)
+
+        while len(self._by_user) > self.max_users:
+            self._forget(next(iter(self._by_user)))
+            self.stats["evictions"] += 1
+        return user_characters
+
+    def _rank(self, user_id: int):
+        user_characters = self._by_user[user_id]
+        # sorted() is stable, so characters never played stay in save order.
+        self._by_recency[user_id] = sorted(
+            user_characters, key=lambda character_id: -user_characters[character_id].last_played
+        )
+
+    def _forget(self, user_id: int):
+        self._by_user.pop(user_id, None)
+        self._loaded_at.pop(user_id, None)
+        self._by_recency.pop(user_id, None)
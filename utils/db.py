@@ -1,14 +1,25 @@
 import os
 import json
+import hashlib
+import queue
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 import mysql.connector
+from mysql.connector.errors import PoolError
 
 EASTERN = ZoneInfo("America/New_York")
 
+DEFAULT_POOL_SIZE = 5
+DEFAULT_POOL_TIMEOUT = 10.0
+POOL_PING_AFTER_SECONDS = 60.0
+# rss_seen.entry_id was a VARCHAR(255) before ids were stored as hashes.
+LEGACY_ENTRY_ID_LENGTH = 255
 
-def _connect():
+
+def _open_connection():
     return mysql.connector.connect(
         host=os.getenv("DATABASE_HOST"),
         port=3306,
@@ -17,9 +28,170 @@ def _connect():
         database=os.getenv("DATABASE_NAME"),
         charset="utf8mb4",
         collation="utf8mb4_unicode_ci",
+        autocommit=True,
     )
 
 
+class _PooledConnection:
+    """A checked-out connection. close() hands it back to the pool instead of disconnecting."""
+
+    def __init__(self, pool: "ConnectionPool", raw):
+        self._pool = pool
+        self._raw = raw
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if self._raw is not None:
+            raw, self._raw = self._raw, None
+            self._pool.release(raw)
+
+
+class ConnectionPool:
+    """Fixed-size pool of warm MySQL connections shared by every helper in this module.
+
+    Connections are opened lazily up to ``size``. A connection that sat idle longer than
+    ``ping_after`` seconds is pinged on checkout and reconnected if the server dropped it;
+    fresher ones are handed out without an extra round trip.
+    """
+
+    def __init__(self, factory, size: int, checkout_timeout: float, ping_after: float = POOL_PING_AFTER_SECONDS):
+        self._factory = factory
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.ping_after = ping_after
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._stats = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "opened": 0,
+            "reconnects": 0,
+            "discarded": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    def _bump(self, key: str, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["in_use"] = self._in_use
+        snapshot["idle"] = self._idle.qsize()
+        checkouts = snapshot["checkouts"]
+        snapshot["wait_ms_avg"] = snapshot["wait_ms_total"] / checkouts if checkouts else 0.0
+        return snapshot
+
+    def acquire(self) -> _PooledConnection:
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            self._bump("timeouts")
+            raise PoolError(f"Timed out after {self.checkout_timeout}s waiting for a database connection")
+
+        waited_ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["wait_ms_total"] += waited_ms
+            self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], waited_ms)
+
+        try:
+            try:
+                raw, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                raw = self._factory()
+                self._bump("opened")
+            else:
+                if time.monotonic() - last_used > self.ping_after:
+                    raw = self._ensure_alive(raw)
+        except Exception:
+            self._return_slot()
+            raise
+        return _PooledConnection(self, raw)
+
+    def _return_slot(self):
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
+
+    def _ensure_alive(self, raw):
+        try:
+            raw.ping(reconnect=False)
+            return raw
+        except mysql.connector.Error:
+            self._bump("reconnects")
+            try:
+                raw.close()
+            except Exception:
+                pass
+            return self._factory()
+
+    def release(self, raw):
+        try:
+            if raw.unread_result:
+                raw.consume_results()
+            if raw.in_transaction:
+                raw.rollback()
+            self._idle.put((raw, time.monotonic()))
+        except Exception:
+            self._bump("discarded")
+            try:
+                raw.close()
+            except Exception:
+                pass
+        finally:
+            self._return_slot()
+
+    def close_all(self):
+        while True:
+            try:
+                raw, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+
+_pool: ConnectionPool | None = None
+_pool_init_lock = threading.Lock()
+
+
+def _get_pool() -> ConnectionPool:
+    # Built on first use rather than at import time so .env has been loaded by then.
+    global _pool
+    if _pool is None:
+        with _pool_init_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    _open_connection,
+                    size=int(os.getenv("DATABASE_POOL_SIZE", DEFAULT_POOL_SIZE)),
+                    checkout_timeout=float(os.getenv("DATABASE_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)),
+                )
+    return _pool
+
+
+def _connect():
+    return _get_pool().acquire()
+
+
+def pool_stats() -> dict:
+    """Checkout counts, wait times and reconnects for the shared connection pool."""
+    return _get_pool().stats()
+
+
+def close_pool():
+    if _pool is not None:
+        _pool.close_all()
+
+
 def init_schema():
     conn = _connect()
     try:
@@ -30,39 +202,105 @@ def init_schema():
                 url VARCHAR(500) NOT NULL,
                 name VARCHAR(255) NOT NULL,
                 avatar_url VARCHAR(1000),
-                PRIMARY KEY (user_id, url)
+                ddb_etag VARCHAR(255) NULL,
+                refreshed_at TIMESTAMP NULL,
+                saved_seq BIGINT NOT NULL AUTO_INCREMENT,
+                PRIMARY KEY (user_id, url),
+                UNIQUE KEY uq_characters_saved_seq (saved_seq),
+                INDEX idx_characters_url (url)
             ) CHARACTER SET utf8mb4
         """)
+        cursor.execute("SHOW COLUMNS FROM characters LIKE 'refreshed_at'")
+        if not cursor.fetchone():
+            cursor.execute(
+                "ALTER TABLE characters ADD COLUMN ddb_etag VARCHAR(255) NULL, ADD COLUMN refreshed_at TIMESTAMP NULL"
+            )
+        cursor.execute("SHOW COLUMNS FROM characters LIKE 'saved_seq'")
+        if not cursor.fetchone():
+            # Existing rows are numbered in primary key order, the order they were listed in before.
+            cursor.execute(
+                "ALTER TABLE characters ADD COLUMN saved_seq BIGINT NOT NULL AUTO_INCREMENT, "
+                "ADD UNIQUE KEY uq_characters_saved_seq (saved_seq)"
+            )
+        # The background refresh groups and updates by url alone, across every user.
+        cursor.execute("SHOW INDEX FROM characters WHERE Key_name = 'idx_characters_url'")
+        if not cursor.fetchall():
+            cursor.execute("CREATE INDEX idx_characters_url ON characters (url)")
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS feeds (
                 url VARCHAR(255) NOT NULL,
                 channel_id BIGINT NOT NULL,
                 name VARCHAR(255) NOT NULL,
+                etag VARCHAR(255) NULL,
+                modified VARCHAR(64) NULL,
+                next_poll_at DATETIME NULL,
+                poll_interval_s INT NULL,
+                digest_threshold INT NULL,
+                catch_up_max_per_cycle INT NULL,
+                catch_up_max_age_hours INT NULL,
+                backfill_count INT NULL,
                 PRIMARY KEY (url)
             ) CHARACTER SET utf8mb4
         """)
+        cursor.execute("SHOW COLUMNS FROM feeds LIKE 'etag'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE feeds ADD COLUMN etag VARCHAR(255) NULL, ADD COLUMN modified VARCHAR(64) NULL")
+        cursor.execute("SHOW COLUMNS FROM feeds LIKE 'next_poll_at'")
+        if not cursor.fetchone():
+            cursor.execute(
+                "ALTER TABLE feeds ADD COLUMN next_poll_at DATETIME NULL, ADD COLUMN poll_interval_s INT NULL"
+            )
+        cursor.execute("SHOW COLUMNS FROM feeds LIKE 'digest_threshold'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE feeds ADD COLUMN digest_threshold INT NULL")
+        cursor.execute("SHOW COLUMNS FROM feeds LIKE 'catch_up_max_per_cycle'")
+        if not cursor.fetchone():
+            cursor.execute(
+                "ALTER TABLE feeds ADD COLUMN catch_up_max_per_cycle INT NULL, "
+                "ADD COLUMN catch_up_max_age_hours INT NULL, ADD COLUMN backfill_count INT NULL"
+            )
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS rss_seen (
                 feed_url VARCHAR(255) NOT NULL,
-                entry_id VARCHAR(255) NOT NULL,
+                entry_hash CHAR(64) NOT NULL,
                 seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (feed_url, entry_id)
+                PRIMARY KEY (feed_url, entry_hash),
+                INDEX idx_rss_seen_feed_seen_at (feed_url, seen_at)
             ) CHARACTER SET utf8mb4
         """)
+        cursor.execute("SHOW COLUMNS FROM rss_seen LIKE 'entry_hash'")
+        if not cursor.fetchone():
+            # SHA2() over the stored utf8mb4 id matches entry_hash() of the id as it was stored,
+            # truncated to LEGACY_ENTRY_ID_LENGTH; is_entry_seen() checks that hash too.
+            cursor.execute("ALTER TABLE rss_seen ADD COLUMN entry_hash CHAR(64) NULL")
+            cursor.execute("UPDATE rss_seen SET entry_hash = SHA2(entry_id, 256)")
+            cursor.execute(
+                "ALTER TABLE rss_seen DROP PRIMARY KEY, DROP COLUMN entry_id, "
+                "MODIFY entry_hash CHAR(64) NOT NULL, ADD PRIMARY KEY (feed_url, entry_hash)"
+            )
+        cursor.execute("SHOW INDEX FROM rss_seen WHERE Key_name = 'idx_rss_seen_feed_seen_at'")
+        if not cursor.fetchall():
+            cursor.execute("CREATE INDEX idx_rss_seen_feed_seen_at ON rss_seen (feed_url, seen_at)")
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS watched_schedules (
+            CREATE TABLE IF NOT EXISTS rss_fingerprints (
                 channel_id BIGINT NOT NULL,
-                message_id BIGINT NOT NULL,
-                PRIMARY KEY (channel_id)
+                fingerprint CHAR(64) NOT NULL,
+                seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (channel_id, fingerprint),
+                INDEX idx_rss_fingerprints_seen_at (seen_at)
             ) CHARACTER SET utf8mb4
         """)
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS last_warhorn_sessions (
+            CREATE TABLE IF NOT EXISTS watched_schedules (
                 channel_id BIGINT NOT NULL,
-                sessions_data LONGTEXT NOT NULL,
+                message_id BIGINT NOT NULL,
+                schedule_hash CHAR(64) NULL,
                 PRIMARY KEY (channel_id)
             ) CHARACTER SET utf8mb4
         """)
+        cursor.execute("SHOW COLUMNS FROM watched_schedules LIKE 'schedule_hash'")
+        if not cursor.fetchone():
+            cursor.execute("ALTER TABLE watched_schedules ADD COLUMN schedule_hash CHAR(64) NULL")
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS sessions (
                 id INT AUTO_INCREMENT PRIMARY KEY,
@@ -110,9 +348,18 @@ def init_schema():
         """)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS schedule_subscribers (
-                discord_user_id BIGINT PRIMARY KEY
+                discord_user_id BIGINT PRIMARY KEY,
+                failure_count INT NOT NULL DEFAULT 0,
+                last_failure_at TIMESTAMP NULL
             ) CHARACTER SET utf8mb4
         """)
+        cursor.execute("SHOW COLUMNS FROM schedule_subscribers LIKE 'failure_count'")
+        if not cursor.fetchone():
+            cursor.execute(
+                "ALTER TABLE schedule_subscribers "
+                "ADD COLUMN failure_count INT NOT NULL DEFAULT 0, "
+                "ADD COLUMN last_failure_at TIMESTAMP NULL"
+            )
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS adventure_wishlist (
                 discord_user_id BIGINT NOT NULL,
@@ -212,8 +459,8 @@ def _migrate_rss_seen():
             for feed_url, entry_ids in seen.items():
                 for entry_id in entry_ids:
                     cursor.execute(
-                        "INSERT IGNORE INTO rss_seen (feed_url, entry_id) VALUES (%s, %s)",
-                        (feed_url[:255], entry_id[:255]),
+                        "INSERT IGNORE INTO rss_seen (feed_url, entry_hash) VALUES (%s, %s)",
+                        (feed_url[:255], entry_hash(entry_id)),
                     )
             conn.commit()
             cursor.close()
@@ -255,18 +502,8 @@ def _migrate_last_warhorn_sessions():
     try:
         with open("last_warhorn_sessions.json") as f:
             sessions = json.load(f)
-        conn = _connect()
-        try:
-            cursor = conn.cursor()
-            for channel_id_str, sessions_data in sessions.items():
-                cursor.execute(
-                    "INSERT IGNORE INTO last_warhorn_sessions (channel_id, sessions_data) VALUES (%s, %s)",
-                    (int(channel_id_str), json.dumps(sessions_data, default=str)),
-                )
-            conn.commit()
-            cursor.close()
-        finally:
-            conn.close()
+        for sessions_data in sessions.values():
+            record_warhorn_sessions(sessions_data)
         os.rename("last_warhorn_sessions.json", "last_warhorn_sessions.json.migrated")
         print("[DB] Migrated last_warhorn_sessions.json to database.")
     except Exception as e:
@@ -275,23 +512,39 @@ def _migrate_last_warhorn_sessions():
 
 # --- Characters ---
 
-def load_all_characters() -> dict:
+def load_user_characters(user_id: int) -> list:
+    """A user's saved characters in the order they were first saved, with when each was
+    last played according to session_players."""
     conn = _connect()
     try:
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT user_id, url, name, avatar_url FROM characters")
+        cursor.execute(
+            """SELECT c.url, c.name, c.avatar_url, lp.last_played
+               FROM characters c
+               LEFT JOIN (
+                   SELECT sp.character_url, MAX(s.session_starts_at) AS last_played
+                   FROM session_players sp
+                   JOIN sessions s ON s.id = sp.session_id
+                   WHERE sp.discord_user_id=%s
+                   GROUP BY sp.character_url
+               ) lp ON lp.character_url = c.url
+               WHERE c.user_id=%s
+               ORDER BY c.saved_seq""",
+            (user_id, user_id),
+        )
         rows = cursor.fetchall()
         cursor.close()
     finally:
         conn.close()
-    result = {}
-    for row in rows:
-        result.setdefault(row["user_id"], []).append({
+    return [
+        {
             "url": row["url"],
             "name": row["name"],
             "avatar_url": row["avatar_url"],
-        })
-    return result
+            "last_played": row["last_played"].replace(tzinfo=timezone.utc) if row["last_played"] else None,
+        }
+        for row in rows
+    ]
 
 
 def save_character(user_id: int, url: str, name: str, avatar_url):
@@ -310,43 +563,158 @@ def save_character(user_id: int, url: str, name: str, avatar_url):
         conn.close()
 
 
+def load_characters_to_refresh(limit: int) -> list:
+    """Up to `limit` distinct saved characters, least recently refreshed (or never) first."""
+    conn = _connect()
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            """SELECT url, MAX(name) AS name, MAX(avatar_url) AS avatar_url, MAX(ddb_etag) AS ddb_etag
+               FROM characters
+               GROUP BY url
+               ORDER BY MIN(refreshed_at)
+               LIMIT %s""",
+            (limit,),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return rows
+
+
+def save_character_refreshes(updates: list, checked_urls: list):
+    """Write a refresh run: `updates` ({url, name, avatar_url, ddb_etag} dicts) for rows
+    whose sheet changed, and only refreshed_at for the other `checked_urls`."""
+    if not updates and not checked_urls:
+        return
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        if updates:
+            cursor.executemany(
+                """UPDATE characters
+                   SET name=%s, avatar_url=%s, ddb_etag=%s, refreshed_at=CURRENT_TIMESTAMP
+                   WHERE url=%s""",
+                [(row["name"], row["avatar_url"], row["ddb_etag"], row["url"]) for row in updates],
+            )
+        if checked_urls:
+            placeholders = ", ".join(["%s"] * len(checked_urls))
+            cursor.execute(
+                f"UPDATE characters SET refreshed_at=CURRENT_TIMESTAMP WHERE url IN ({placeholders})",
+                tuple(checked_urls),
+            )
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
 # --- Feeds ---
 
 def load_all_feeds() -> list:
     conn = _connect()
     try:
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT url, channel_id, name FROM feeds")
+        cursor.execute(
+            """SELECT url, channel_id, name, etag, modified, next_poll_at, poll_interval_s, digest_threshold,
+                      catch_up_max_per_cycle, catch_up_max_age_hours, backfill_count
+               FROM feeds"""
+        )
         rows = cursor.fetchall()
         cursor.close()
     finally:
         conn.close()
-    return [{"url": r["url"], "channel_id": r["channel_id"], "name": r["name"]} for r in rows]
+    return [
+        {
+            "url": r["url"],
+            "channel_id": r["channel_id"],
+            "name": r["name"],
+            "etag": r["etag"],
+            "modified": r["modified"],
+            "next_poll_at": r["next_poll_at"].replace(tzinfo=timezone.utc) if r["next_poll_at"] else None,
+            "poll_interval_s": r["poll_interval_s"],
+            "digest_threshold": r["digest_threshold"],
+            "catch_up_max_per_cycle": r["catch_up_max_per_cycle"],
+            "catch_up_max_age_hours": r["catch_up_max_age_hours"],
+            "backfill_count": r["backfill_count"],
+        }
+        for r in rows
+    ]
+
+
+def save_feed_validators(url: str, etag: str | None, modified: str | None):
+    """Remember a feed's ETag / Last-Modified so the next poll can be a conditional GET."""
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE feeds SET etag=%s, modified=%s WHERE url=%s",
+            (etag[:255] if etag else None, modified[:64] if modified else None, url[:255]),
+        )
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def save_feed_schedule(url: str, next_poll_at: datetime, poll_interval_s: int):
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE feeds SET next_poll_at=%s, poll_interval_s=%s WHERE url=%s",
+            (next_poll_at.astimezone(timezone.utc).replace(tzinfo=None), poll_interval_s, url[:255]),
+        )
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
 
 
 # --- RSS Seen ---
 
-def get_seen_ids(feed_url: str) -> set:
+def entry_hash(entry_id: str) -> str:
+    """Fixed-width key for an RSS entry id, so long ids sharing a prefix can't collide."""
+    return hashlib.sha256(entry_id.encode("utf-8")).hexdigest()
+
+
+def is_entry_seen(entry_id: str, seen) -> bool:
+    """Whether an entry id is in a feed's set of seen hashes.
+
+    Rows migrated from the old entry_id column were hashed from the id truncated to
+    LEGACY_ENTRY_ID_LENGTH, so longer ids are also checked under that hash.
+    """
+    if entry_hash(entry_id) in seen:
+        return True
+    return len(entry_id) > LEGACY_ENTRY_ID_LENGTH and entry_hash(entry_id[:LEGACY_ENTRY_ID_LENGTH]) in seen
+
+
+def load_all_seen_hashes() -> dict:
+    """Seen entry hashes for every feed, as {feed_url: set of hashes}."""
     conn = _connect()
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT entry_id FROM rss_seen WHERE feed_url=%s", (feed_url[:255],))
+        cursor.execute("SELECT feed_url, entry_hash FROM rss_seen")
         rows = cursor.fetchall()
         cursor.close()
     finally:
         conn.close()
-    return {row[0] for row in rows}
+    seen: dict[str, set] = {}
+    for feed_url, hashed in rows:
+        seen.setdefault(feed_url, set()).add(hashed)
+    return seen
 
 
-def add_seen_ids(feed_url: str, entry_ids):
-    if not entry_ids:
+def add_seen_hashes(feed_url: str, hashes):
+    if not hashes:
         return
     conn = _connect()
     try:
         cursor = conn.cursor()
         cursor.executemany(
-            "INSERT IGNORE INTO rss_seen (feed_url, entry_id) VALUES (%s, %s)",
-            [(feed_url[:255], eid[:255]) for eid in entry_ids],
+            "INSERT IGNORE INTO rss_seen (feed_url, entry_hash) VALUES (%s, %s)",
+            [(feed_url[:255], hashed) for hashed in hashes],
         )
         conn.commit()
         cursor.close()
@@ -354,45 +722,63 @@ def add_seen_ids(feed_url: str, entry_ids):
         conn.close()
 
 
-def prune_seen(feed_url: str, max_count: int):
+def prune_seen_entries(max_age_days: int, max_per_feed: int, min_per_feed: int) -> int:
+    """Apply rss_seen retention across every feed in one statement. Returns rows deleted.
+
+    Per feed, rows beyond the newest `max_per_feed` go, as do rows older than
+    `max_age_days` outside the newest `min_per_feed`. The floor stops a quiet feed
+    that still lists year-old posts from having them reposted once aged out.
+    """
     conn = _connect()
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM rss_seen WHERE feed_url=%s", (feed_url[:255],))
-        count = cursor.fetchone()[0]
-        if count > max_count:
-            cursor.execute(
-                "DELETE FROM rss_seen WHERE feed_url=%s ORDER BY seen_at ASC LIMIT %s",
-                (feed_url[:255], count - max_count),
-            )
-            conn.commit()
+        cursor.execute(
+            """DELETE s FROM rss_seen s
+               JOIN (
+                   SELECT feed_url, entry_hash FROM (
+                       SELECT feed_url, entry_hash, seen_at,
+                              ROW_NUMBER() OVER (PARTITION BY feed_url ORDER BY seen_at DESC, entry_hash) AS rn
+                       FROM rss_seen
+                   ) ranked
+                   WHERE rn > %s OR (rn > %s AND seen_at < CURRENT_TIMESTAMP - INTERVAL %s DAY)
+               ) doomed USING (feed_url, entry_hash)""",
+            (max_per_feed, min_per_feed, max_age_days),
+        )
+        deleted = cursor.rowcount
+        conn.commit()
         cursor.close()
+        return deleted
     finally:
         conn.close()
 
 
-# --- Watched Schedules ---
+# --- RSS Fingerprints ---
 
-def load_all_watched_schedules() -> dict:
+def load_all_fingerprints() -> dict:
+    """Content fingerprints already posted, as {channel_id: set of fingerprints}."""
     conn = _connect()
     try:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT channel_id, message_id FROM watched_schedules")
+        cursor = conn.cursor()
+        cursor.execute("SELECT channel_id, fingerprint FROM rss_fingerprints")
         rows = cursor.fetchall()
         cursor.close()
     finally:
         conn.close()
-    return {r["channel_id"]: {"channel_id": r["channel_id"], "message_id": r["message_id"]} for r in rows}
+    fingerprints: dict[int, set] = {}
+    for channel_id, fingerprint in rows:
+        fingerprints.setdefault(channel_id, set()).add(fingerprint)
+    return fingerprints
 
 
-def save_watched_schedule(channel_id: int, message_id: int):
+def add_fingerprints(channel_id: int, fingerprints):
+    if not fingerprints:
+        return
     conn = _connect()
     try:
         cursor = conn.cursor()
-        cursor.execute(
-            """INSERT INTO watched_schedules (channel_id, message_id) VALUES (%s, %s)
-               ON DUPLICATE KEY UPDATE message_id=VALUES(message_id)""",
-            (channel_id, message_id),
+        cursor.executemany(
+            "INSERT IGNORE INTO rss_fingerprints (channel_id, fingerprint) VALUES (%s, %s)",
+            [(channel_id, fingerprint) for fingerprint in fingerprints],
         )
         conn.commit()
         cursor.close()
@@ -400,39 +786,47 @@ def save_watched_schedule(channel_id: int, message_id: int):
         conn.close()
 
 
-def remove_watched_schedule(channel_id: int):
+def prune_fingerprints(max_age_days: int) -> int:
     conn = _connect()
     try:
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM watched_schedules WHERE channel_id=%s", (channel_id,))
+        cursor.execute(
+            "DELETE FROM rss_fingerprints WHERE seen_at < CURRENT_TIMESTAMP - INTERVAL %s DAY",
+            (max_age_days,),
+        )
+        deleted = cursor.rowcount
         conn.commit()
         cursor.close()
+        return deleted
     finally:
         conn.close()
 
 
-# --- Last Warhorn Sessions ---
+# --- Watched Schedules ---
 
-def load_all_last_sessions() -> dict:
+def load_all_watched_schedules() -> dict:
     conn = _connect()
     try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT channel_id, sessions_data FROM last_warhorn_sessions")
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("SELECT channel_id, message_id, schedule_hash FROM watched_schedules")
         rows = cursor.fetchall()
         cursor.close()
     finally:
         conn.close()
-    return {row[0]: json.loads(row[1]) for row in rows}
+    return {
+        r["channel_id"]: {"channel_id": r["channel_id"], "message_id": r["message_id"], "schedule_hash": r["schedule_hash"]}
+        for r in rows
+    }
 
 
-def save_last_sessions(channel_id: int, sessions_data: list):
+def save_watched_schedule(channel_id: int, message_id: int, schedule_hash: str | None):
     conn = _connect()
     try:
         cursor = conn.cursor()
         cursor.execute(
-            """INSERT INTO last_warhorn_sessions (channel_id, sessions_data) VALUES (%s, %s)
-               ON DUPLICATE KEY UPDATE sessions_data=VALUES(sessions_data)""",
-            (channel_id, json.dumps(sessions_data, default=str)),
+            """INSERT INTO watched_schedules (channel_id, message_id, schedule_hash) VALUES (%s, %s, %s)
+               ON DUPLICATE KEY UPDATE message_id=VALUES(message_id), schedule_hash=VALUES(schedule_hash)""",
+            (channel_id, message_id, schedule_hash),
         )
         conn.commit()
         cursor.close()
@@ -440,11 +834,25 @@ def save_last_sessions(channel_id: int, sessions_data: list):
         conn.close()
 
 
-def remove_last_sessions(channel_id: int):
+def save_schedule_hash(channel_id: int, schedule_hash: str):
     conn = _connect()
     try:
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM last_warhorn_sessions WHERE channel_id=%s", (channel_id,))
+        cursor.execute(
+            "UPDATE watched_schedules SET schedule_hash=%s WHERE channel_id=%s",
+            (schedule_hash, channel_id),
+        )
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def remove_watched_schedule(channel_id: int):
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM watched_schedules WHERE channel_id=%s", (channel_id,))
         conn.commit()
         cursor.close()
     finally:
@@ -511,8 +919,35 @@ def _backfill_warhorn_sessions(cursor) -> None:
 
 
 def seed_warhorn_sessions_from_cache() -> None:
-    for sessions_data in load_all_last_sessions().values():
-        record_warhorn_sessions(sessions_data)
+    """One-time import of the retired last_warhorn_sessions cache into warhorn_sessions, then drop it.
+
+    Watched schedules now keep a schedule_hash instead of a full copy of the sessions per channel.
+    """
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SHOW TABLES LIKE 'last_warhorn_sessions'")
+        if not cursor.fetchone():
+            cursor.close()
+            return
+        cursor.execute("SELECT sessions_data FROM last_warhorn_sessions")
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+
+    for (sessions_data,) in rows:
+        record_warhorn_sessions(json.loads(sessions_data))
+
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE IF EXISTS last_warhorn_sessions")
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+    print(f"[DB] Moved {len(rows)} cached schedule(s) from last_warhorn_sessions into warhorn_sessions.")
 
 
 def get_recent_warhorn_sessions(limit: int = 8, now: datetime | None = None) -> list[dict]:
@@ -566,6 +1001,29 @@ def get_character_selection(user_id: int):
         conn.close()
 
 
+def get_character_selections(user_ids: list) -> dict:
+    """{user_id: {character_url, character_name}} for those of `user_ids` with a selection."""
+    if not user_ids:
+        return {}
+    conn = _connect()
+    try:
+        cursor = conn.cursor(dictionary=True)
+        placeholders = ",".join(["%s"] * len(user_ids))
+        cursor.execute(
+            f"""SELECT discord_user_id, character_url, character_name
+                FROM session_character_selections WHERE discord_user_id IN ({placeholders})""",
+            list(user_ids),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return {
+        row["discord_user_id"]: {"character_url": row["character_url"], "character_name": row["character_name"]}
+        for row in rows
+    }
+
+
 def set_character_selection(user_id: int, character_url: str, character_name: str):
     conn = _connect()
     try:
@@ -818,6 +1276,59 @@ def get_all_subscribers() -> list:
         conn.close()
 
 
+def get_deliverable_subscribers(max_failures: int) -> list:
+    """Subscribers whose DMs haven't failed `max_failures` times in a row."""
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT discord_user_id FROM schedule_subscribers WHERE failure_count < %s",
+            (max_failures,),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        return [row[0] for row in rows]
+    finally:
+        conn.close()
+
+
+def record_subscriber_failures(user_ids: list):
+    if not user_ids:
+        return
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(
+            """UPDATE schedule_subscribers
+               SET failure_count = failure_count + 1, last_failure_at = CURRENT_TIMESTAMP
+               WHERE discord_user_id=%s""",
+            [(user_id,) for user_id in user_ids],
+        )
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def reset_subscriber_failures(user_ids: list):
+    if not user_ids:
+        return
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        placeholders = ", ".join(["%s"] * len(user_ids))
+        cursor.execute(
+            f"""UPDATE schedule_subscribers
+                SET failure_count = 0, last_failure_at = NULL
+                WHERE failure_count > 0 AND discord_user_id IN ({placeholders})""",
+            tuple(user_ids),
+        )
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
 def is_subscribed(user_id: int) -> bool:
     conn = _connect()
     try:
@@ -830,11 +1341,28 @@ def is_subscribed(user_id: int) -> bool:
         conn.close()
 
 
+def get_subscriber_failure_count(user_id: int) -> int | None:
+    """Consecutive undeliverable DMs for a subscriber, or None if they aren't subscribed."""
+    conn = _connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT failure_count FROM schedule_subscribers WHERE discord_user_id=%s", (user_id,))
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
 def add_subscriber(user_id: int):
     conn = _connect()
     try:
         cursor = conn.cursor()
-        cursor.execute("INSERT IGNORE INTO schedule_subscribers (discord_user_id) VALUES (%s)", (user_id,))
+        cursor.execute(
+            """INSERT INTO schedule_subscribers (discord_user_id) VALUES (%s)
+               ON DUPLICATE KEY UPDATE failure_count = 0, last_failure_at = NULL""",
+            (user_id,),
+        )
         conn.commit()
         cursor.close()
     finally:
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+
+import aiohttp
+
+from utils.http_session import PooledSession
+
+DDB_CHARACTER_API = "https://character-service.dndbeyond.com/character/v5/character/{character_id}"
+DDB_CONNECT_TIMEOUT = 5
+DDB_READ_TIMEOUT = 10
+DDB_KEEPALIVE_SECONDS = 300
+DDB_CACHE_TTL_SECONDS = 600
+# Private (403) and missing (404) sheets are remembered for less time, so a player who
+# fixes their privacy setting isn't kept waiting long.
+DDB_NEGATIVE_TTL_SECONDS = 300
+NEGATIVE_STATUSES = (403, 404)
+# Past this many entries, expired ones are dropped and then the oldest go.
+DDB_CACHE_MAX_ENTRIES = 2000
+
+
+@dataclass(frozen=True)
+class DDBCharacter:
+    character_id: str
+    name: str
+    avatar_url: str | None
+
+
+def parse_character(character_id: str, char_data) -> DDBCharacter:
+    if not char_data or "data" not in char_data:
+        raise ValueError("missing_data")
+
+    char_info = char_data["data"]
+    character_name = char_info.get("name", "Unknown Character")
+    if not character_name and char_info.get("username"):
+        character_name = char_info.get("username")
+
+    avatar_url = (char_info.get("decorations") or {}).get("avatarUrl")
+    return DDBCharacter(character_id, character_name, avatar_url)
+
+
+class DDBClient:
+    """D&D Beyond character-service client with a TTL cache keyed by character id.
+
+    One pooled aiohttp session is kept for the client's lifetime, concurrent lookups of
+    the same character share a request, and 403/404 answers are cached too so a private
+    sheet pasted into chat repeatedly costs one request per negative TTL.
+    Call close() when the owning cog unloads.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = DDB_CACHE_TTL_SECONDS,
+        negative_ttl: float = DDB_NEGATIVE_TTL_SECONDS,
+        connect_timeout: float = DDB_CONNECT_TIMEOUT,
+        read_timeout: float = DDB_READ_TIMEOUT,
+        max_connections: int = 4,
+        max_entries: int = DDB_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+        self._session = PooledSession(
+            timeout=aiohttp.ClientTimeout(total=None, connect=connect_timeout, sock_read=read_timeout),
+            max_connections=max_connections,
+            keepalive_timeout=DDB_KEEPALIVE_SECONDS,
+        )
+        # character id -> (expires at, DDBCharacter or the HTTP status that was refused)
+        self._cache: dict[str, tuple[float, DDBCharacter | int]] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.stats = {"hits": 0, "negative_hits": 0, "fetches": 0, "coalesced": 0, "errors": 0}
+
+    async def close(self):
+        await self._session.close()
+
+    def invalidate(self, character_id: str):
+        self._cache.pop(character_id, None)
+
+    async def get_character(self, character_id: str, *, refresh: bool = False) -> DDBCharacter:
+        """Cached character lookup.
+
+        Raises aiohttp.ClientResponseError for HTTP errors (cached ones included),
+        aiohttp.ClientError on network failure, json.JSONDecodeError for a non-JSON
+        body and ValueError("missing_data") for a response without character data.
+        With refresh, any cached answer is ignored and the sheet is fetched again, as
+        when a user explicitly adds a character they may have just renamed or unlocked.
+        """
+        cached = self._cache.get(character_id)
+        if not refresh and cached is not None and cached[0] > time.monotonic():
+            value = cached[1]
+            if isinstance(value, DDBCharacter):
+                self.stats["hits"] += 1
+                return value
+            self.stats["negative_hits"] += 1
+            raise self._refused(character_id, value)
+
+        task = self._inflight.get(character_id)
+        if task is None:
+            task = asyncio.create_task(self._fetch(character_id))
+            self._inflight[character_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(character_id, None))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    async def _fetch(self, character_id: str) -> DDBCharacter:
+        self.stats["fetches"] += 1
+        try:
+            char_data = await self._request_json(character_id)
+        except aiohttp.ClientResponseError as e:
+            self.stats["errors"] += 1
+            if e.status in NEGATIVE_STATUSES:
+                self._store(character_id, e.status, self.negative_ttl)
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+        character = parse_character(character_id, char_data)
+        self._store(character_id, character, self.ttl)
+        return character
+
+    def _store(self, character_id: str, value: DDBCharacter | int, ttl: float):
+        now = time.monotonic()
+        self._cache.pop(character_id, None)
+        self._cache[character_id] = (now + ttl, value)
+        if len(self._cache) > self.max_entries:
+            self._cache = {key: entry for key, entry in self._cache.items() if entry[0] > now}
+            # Insertion order is fetch order, so the front holds the oldest answers.
+            while len(self._cache) > self.max_entries:
+                del self._cache[next(iter(self._cache))]
+
+    async def _request_json(self, character_id: str):
+        url = DDB_CHARACTER_API.format(character_id=character_id)
+        print(f"Fetching character data from: {url}")
+        async with self._session.get().get(url) as response:
+            response.raise_for_status()
+            text = await response.text()
+        return json.loads(text)
+
+    async def refresh_character(self, character_id: str, etag: str | None = None) -> tuple[DDBCharacter | None, str | None]:
+        """Uncached conditional lookup for background refreshes.
+
+        Returns (None, etag) when the sheet is unchanged since `etag` (a 304), otherwise
+        the parsed character and the response's ETag, which also refreshes the cache.
+        Raises the same errors as get_character.
+        """
+        self.stats["fetches"] += 1
+        try:
+            status, new_etag, char_data = await self._request_conditional(character_id, etag)
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        if status == 304:
+            return None, etag
+
+        character = parse_character(character_id, char_data)
+        self._store(character_id, character, self.ttl)
+        return character, new_etag
+
+    async def _request_conditional(self, character_id: str, etag: str | None):
+        url = DDB_CHARACTER_API.format(character_id=character_id)
+        headers = {"If-None-Match": etag} if etag else {}
+        async with self._session.get().get(url, headers=headers) as response:
+            if response.status == 304:
+                return 304, etag, None
+            response.raise_for_status()
+            text = await response.text()
+            return response.status, response.headers.get("ETag"), json.loads(text)
+
+    def _refused(self, character_id: str, status: int) -> aiohttp.ClientResponseError:
+        return aiohttp.ClientResponseError(None, (), status=status, message="cached")
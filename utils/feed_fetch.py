@@ -0,0 +1,160 @@
+"""Feed download on the event loop, parsing in a small process pool.
+
+feedparser's HTML sanitizing and date parsing are CPU-bound and hold the GIL, so
+running them on a thread still slows the gateway. Downloads stay in the bot's
+process on aiohttp with timeouts, so a stalled host can only hold up its own feed;
+workers get the response body and hand back compact picklable records.
+"""
+import asyncio
+import hashlib
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+import feedparser
+
+from utils.http_session import PooledSession
+
+FEED_WORKERS = 2
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=10, sock_read=30)
+# A worker stuck on a pathological document must not hold up the poll that awaits it.
+PARSE_TIMEOUT_SECONDS = 30
+SUMMARY_LIMIT = 300
+
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+WHITESPACE_RE = re.compile(r"\s+")
+# Query parameters that only identify where a click came from, not what it points at.
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "affiliate_id", "src"}
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_session = PooledSession(headers={"User-Agent": feedparser.USER_AGENT})
+
+
+@dataclass(frozen=True)
+class FeedEntry:
+    entry_id: str
+    title: str
+    link: str
+    summary: str
+    timestamp: datetime | None
+    fingerprint: str
+
+
+@dataclass(frozen=True)
+class FeedResult:
+    status: int | None
+    etag: str | None
+    modified: str | None
+    headers: dict
+    entries: tuple[FeedEntry, ...]
+    # Set when the feed couldn't be parsed and yielded no entries.
+    error: str | None = None
+
+
+def _strip_html(text: str) -> str:
+    return HTML_TAG_RE.sub("", text).strip()
+
+
+def normalize_link(link: str) -> str:
+    """Canonical form of an entry link: no tracking params, fragment, www. or trailing slash."""
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ))
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       host, parts.path.rstrip("/"), query, ""))
+
+
+def content_fingerprint(link: str, title: str) -> str:
+    """Identifies the same post arriving through different feeds."""
+    normalized_title = WHITESPACE_RE.sub(" ", title).strip().casefold()
+    key = f"{normalize_link(link) if link else ''}\n{normalized_title}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _entry_record(entry) -> FeedEntry:
+    summary = _strip_html(entry.get("summary") or "")
+    if len(summary) > SUMMARY_LIMIT:
+        summary = summary[:SUMMARY_LIMIT - 3] + "..."
+
+    published = entry.get("published_parsed") or entry.get("updated_parsed")
+    title = entry.get("title") or ""
+    link = entry.get("link", "")
+    return FeedEntry(
+        entry_id=entry.get("id") or entry.get("link") or entry.get("title", ""),
+        title=title,
+        link=link,
+        summary=summary,
+        timestamp=datetime(*published[:6], tzinfo=timezone.utc) if published else None,
+        fingerprint=content_fingerprint(link, title),
+    )
+
+
+def parse_feed(content: bytes, headers: dict) -> tuple[tuple[FeedEntry, ...], str | None]:
+    """Parse a downloaded feed into (entries, error). Runs in a worker process, so it must stay module-level."""
+    parsed = feedparser.parse(content, response_headers=headers)
+    error = None
+    if parsed.bozo and not parsed.entries:
+        error = str(parsed.get("bozo_exception"))
+    return tuple(_entry_record(entry) for entry in parsed.entries), error
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn, not fork: forking a process that is running discord.py's threads is unsafe.
+                _executor = ProcessPoolExecutor(
+                    max_workers=FEED_WORKERS, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _executor
+
+
+async def fetch(url: str, etag: str | None = None, modified: str | None = None) -> FeedResult:
+    """Conditional GET of a feed, parsed in the worker pool.
+
+    Raises aiohttp.ClientError for HTTP and network errors and TimeoutError when the
+    download or the parse takes too long.
+    """
+    request_headers = {}
+    if etag:
+        request_headers["If-None-Match"] = etag
+    if modified:
+        request_headers["If-Modified-Since"] = modified
+
+    async with _session.get().get(url, headers=request_headers, timeout=FETCH_TIMEOUT) as response:
+        headers = {key.lower(): value for key, value in response.headers.items()}
+        if response.status == 304:
+            return FeedResult(status=304, etag=etag, modified=modified, headers=headers, entries=())
+        response.raise_for_status()
+        content = await response.read()
+
+    loop = asyncio.get_running_loop()
+    entries, error = await asyncio.wait_for(
+        loop.run_in_executor(_get_executor(), parse_feed, content, headers), PARSE_TIMEOUT_SECONDS
+    )
+    return FeedResult(
+        status=response.status,
+        etag=headers.get("etag"),
+        modified=headers.get("last-modified"),
+        headers=headers,
+        entries=entries,
+        error=error,
+    )
+
+
+async def shutdown():
+    global _executor
+    await _session.close()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
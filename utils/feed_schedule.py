@@ -0,0 +1,153 @@
+import random
+import re
+import statistics
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+DEFAULT_POLL_INTERVAL = timedelta(minutes=60)
+MIN_POLL_INTERVAL = timedelta(minutes=10)
+MAX_POLL_INTERVAL = timedelta(hours=12)
+# How much longer to wait after a poll that found nothing new and no cadence to go on.
+UNCHANGED_BACKOFF = 1.5
+JITTER_FRACTION = 0.1
+# Only the most recent gaps between entries count towards a feed's cadence.
+CADENCE_SAMPLE = 10
+
+# Catch-up defaults; feeds can override each through their catch_up_* / backfill_count columns.
+# One full message of embeds (Discord allows 10), so a catch-up cycle still posts one message.
+CATCH_UP_MAX_PER_CYCLE = 10
+CATCH_UP_MAX_AGE = timedelta(days=7)
+BACKFILL_COUNT = 0
+# A poll this late means the bot was down, so the feed is treated as catching up.
+CATCH_UP_OVERDUE = timedelta(hours=1)
+
+MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def publish_cadence(timestamps: list[datetime]) -> timedelta | None:
+    """Median gap between a feed's most recent entries, or None with fewer than two."""
+    ordered = sorted(set(timestamps), reverse=True)[:CADENCE_SAMPLE + 1]
+    if len(ordered) < 2:
+        return None
+    gaps = [(newer - older).total_seconds() for newer, older in zip(ordered, ordered[1:])]
+    return timedelta(seconds=statistics.median(gaps))
+
+
+def cache_lifetime(headers: dict, now: datetime) -> timedelta | None:
+    """How long the server says the response stays fresh, from Cache-Control or Expires."""
+    headers = {key.lower(): value for key, value in (headers or {}).items()}
+
+    match = MAX_AGE_RE.search(headers.get("cache-control", ""))
+    if match:
+        return timedelta(seconds=int(match.group(1)))
+
+    expires = headers.get("expires")
+    if expires:
+        try:
+            expires_at = parsedate_to_datetime(expires)
+        except (TypeError, ValueError):
+            return None
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return max(expires_at - now, timedelta(0))
+    return None
+
+
+def compute_poll_interval(
+    previous: timedelta | None,
+    *,
+    cadence: timedelta | None = None,
+    cache_for: timedelta | None = None,
+    changed: bool = True,
+) -> timedelta:
+    """Next poll interval for a feed, before jitter.
+
+    Polls about twice per observed publish gap. Without a cadence the previous
+    interval is kept, or stretched if the poll found nothing new. The server's
+    cache lifetime is a floor, and the result is clamped to the min/max bounds.
+    """
+    previous = previous or DEFAULT_POLL_INTERVAL
+    if cadence is not None:
+        interval = cadence / 2
+    elif changed:
+        interval = previous
+    else:
+        interval = previous * UNCHANGED_BACKOFF
+
+    if cache_for is not None:
+        interval = max(interval, cache_for)
+    return min(max(interval, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL)
+
+
+def with_jitter(interval: timedelta, fraction: float = JITTER_FRACTION, rng=random.random) -> timedelta:
+    """Spread polls by up to ±fraction so feeds scheduled together drift apart."""
+    return interval * (1 + fraction * (2 * rng() - 1))
+
+
+def spread_overdue(count: int, now: datetime, window: timedelta) -> list[datetime]:
+    """Due times for `count` overdue feeds, evenly spaced across `window` starting now."""
+    if count <= 0:
+        return []
+    step = window / count
+    return [now + step * i for i in range(count)]
+
+
+@dataclass(frozen=True)
+class CatchUpPolicy:
+    max_per_cycle: int = CATCH_UP_MAX_PER_CYCLE
+    max_age: timedelta = CATCH_UP_MAX_AGE
+    # Newest entries to post the first time a feed is polled; the rest are only marked seen.
+    backfill: int = BACKFILL_COUNT
+
+    @classmethod
+    def for_feed(cls, feed_config: dict) -> "CatchUpPolicy":
+        max_age_hours = feed_config.get("catch_up_max_age_hours")
+        backfill = feed_config.get("backfill_count")
+        return cls(
+            max_per_cycle=feed_config.get("catch_up_max_per_cycle") or CATCH_UP_MAX_PER_CYCLE,
+            max_age=timedelta(hours=max_age_hours) if max_age_hours else CATCH_UP_MAX_AGE,
+            backfill=BACKFILL_COUNT if backfill is None else backfill,
+        )
+
+
+@dataclass(frozen=True)
+class CatchUpPlan:
+    post: list
+    defer: list
+    # Marked seen without being posted: too old, or not backfilled on a first run.
+    skip: list
+
+
+def plan_catch_up(
+    entries: list,
+    policy: CatchUpPolicy,
+    now: datetime,
+    *,
+    first_run: bool = False,
+    digest_threshold: int | None = None,
+    overdue: timedelta | None = None,
+) -> CatchUpPlan:
+    """Decide which unseen entries (oldest first, each with a .timestamp) to post this cycle.
+
+    The age and per-cycle limits only apply while a feed is catching up: more unseen
+    entries than one cycle's share, or a poll `overdue` by CATCH_UP_OVERDUE or more.
+    Otherwise every new entry is posted, including backdated ones. A burst that will
+    be collapsed into a digest goes out whole, since it is one message anyway.
+    """
+    catching_up = len(entries) > policy.max_per_cycle or (overdue is not None and overdue >= CATCH_UP_OVERDUE)
+    fresh, skip = [], []
+    if catching_up:
+        cutoff = now - policy.max_age
+        for entry in entries:
+            (fresh if entry.timestamp is None or entry.timestamp >= cutoff else skip).append(entry)
+    else:
+        fresh = list(entries)
+
+    if first_run:
+        split = max(len(fresh) - policy.backfill, 0)
+        skip, fresh = skip + fresh[:split], fresh[split:]
+
+    if digest_threshold and len(fresh) > digest_threshold:
+        return CatchUpPlan(post=fresh, defer=[], skip=skip)
+    return CatchUpPlan(post=fresh[:policy.max_per_cycle], defer=fresh[policy.max_per_cycle:], skip=skip)
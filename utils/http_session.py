@@ -0,0 +1,39 @@
+import aiohttp
+
+KEEPALIVE_SECONDS = 15
+
+
+class PooledSession:
+    """One pooled aiohttp ClientSession, created on first use and again after close().
+
+    aiohttp sessions and connectors must be built inside a running event loop, so
+    clients constructed before the bot starts hold one of these instead of a session.
+    """
+
+    def __init__(
+        self,
+        *,
+        headers: dict | None = None,
+        timeout: aiohttp.ClientTimeout | None = None,
+        max_connections: int = 100,
+        keepalive_timeout: float = KEEPALIVE_SECONDS,
+    ):
+        self.headers = headers
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self._session: aiohttp.ClientSession | None = None
+
+    def get(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=self.timeout or aiohttp.ClientTimeout(total=300),
+                connector=aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=self.keepalive_timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
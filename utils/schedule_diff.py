@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from utils.schedule_format import signup_names
+from utils.warhorn_api import parse_warhorn_dt
+
+SESSION_ADDED = "added"
+SESSION_REMOVED = "removed"
+SESSION_RESCHEDULED = "rescheduled"
+SEAT_OPENED = "seat_opened"
+WAITLIST_MOVED = "waitlist_moved"
+TRUNCATED_SUFFIX = "\n…and more, see the full schedule."
+
+
+@dataclass(frozen=True)
+class ScheduleChange:
+    kind: str
+    session: dict
+    previous: dict | None = None
+    names: tuple[str, ...] = ()
+
+
+def diff_schedules(old: list[dict], new: list[dict], now: datetime | None = None) -> list[ScheduleChange]:
+    """Meaningful changes between two Warhorn snapshots, matched by session id.
+
+    Seat counts that merely wiggle while seats are still open are ignored; a seat only
+    counts as opened when a full session gets one back. Sessions that drop out because
+    they've started are not reported as removed.
+    """
+    now = now or datetime.now(timezone.utc)
+    old_by_id = {session["id"]: session for session in old}
+    new_by_id = {session["id"]: session for session in new}
+    changes: list[ScheduleChange] = []
+
+    for session_id, session in new_by_id.items():
+        previous = old_by_id.get(session_id)
+        if previous is None:
+            changes.append(ScheduleChange(SESSION_ADDED, session))
+            continue
+
+        if parse_warhorn_dt(previous["startsAt"]) != parse_warhorn_dt(session["startsAt"]):
+            changes.append(ScheduleChange(SESSION_RESCHEDULED, session, previous))
+
+        if (previous.get("availablePlayerSeats") or 0) <= 0 < (session.get("availablePlayerSeats") or 0):
+            changes.append(ScheduleChange(SEAT_OPENED, session, previous))
+
+        players = set(signup_names(session.get("playerSignups")))
+        promoted = [name for name in signup_names(previous.get("playerWaitlistEntries")) if name in players]
+        if promoted:
+            changes.append(ScheduleChange(WAITLIST_MOVED, session, previous, tuple(promoted)))
+
+    for session_id, previous in old_by_id.items():
+        if session_id not in new_by_id and parse_warhorn_dt(previous["startsAt"]) > now:
+            changes.append(ScheduleChange(SESSION_REMOVED, previous, previous))
+
+    return sorted(changes, key=lambda change: parse_warhorn_dt(change.session["startsAt"]))
+
+
+def _when(session: dict, style: str = "F") -> str:
+    return f"<t:{int(parse_warhorn_dt(session['startsAt']).timestamp())}:{style}>"
+
+
+def format_schedule_change(change: ScheduleChange) -> str:
+    name = change.session["name"]
+    if change.kind == SESSION_ADDED:
+        return f"🆕 *{name}* was added for {_when(change.session)}"
+    if change.kind == SESSION_REMOVED:
+        return f"❌ *{name}* on {_when(change.session)} was cancelled"
+    if change.kind == SESSION_RESCHEDULED:
+        return f"🕒 *{name}* moved from {_when(change.previous)} to {_when(change.session)}"
+    if change.kind == SEAT_OPENED:
+        seats = change.session.get("availablePlayerSeats", 0)
+        return f"🟢 *{name}* on {_when(change.session, 'D')} has {seats} open seat{'s' if seats != 1 else ''}"
+    if change.kind == WAITLIST_MOVED:
+        return f"🟡 *{name}*: {', '.join(change.names)} moved off the waitlist into a seat"
+    return f"📅 *{name}* was updated"
+
+
+def format_schedule_changes(changes: list[ScheduleChange], limit: int | None = None) -> str:
+    """One line per change, cut at a line boundary (or hard, for one long line) to fit `limit`."""
+    text = "\n".join(format_schedule_change(change) for change in changes)
+    if limit is None or len(text) <= limit:
+        return text
+    limit -= len(TRUNCATED_SUFFIX)
+    cut = text.rfind("\n", 0, limit)
+    return text[:cut if cut > 0 else limit] + TRUNCATED_SUFFIX
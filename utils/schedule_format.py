@@ -0,0 +1,122 @@
+import hashlib
+import json
+import re
+from datetime import datetime
+
+import discord
+
+from utils.warhorn_api import parse_warhorn_dt
+
+SCHEDULE_TITLE = "Upcoming Warhorn Events"
+PLAYER_NAME_RE = re.compile(r"^(.*?)(?:\s*\((.*)\))?$")
+
+
+def format_player_name(full_player_name: str) -> str:
+    """Warhorn names look like `discordtag (Real Name)`; show them as `Real Name (discordtag)`."""
+    match = PLAYER_NAME_RE.match(full_player_name)
+    if not match:
+        return full_player_name
+    discord_tag_or_primary_name = match.group(1).strip()
+    real_name_in_parentheses = match.group(2)
+    if real_name_in_parentheses:
+        return f"{real_name_in_parentheses} ({discord_tag_or_primary_name})"
+    return discord_tag_or_primary_name
+
+
+def signup_names(entries) -> list[str]:
+    return [entry["user"]["name"] for entry in entries or [] if entry.get("user") and entry["user"].get("name")]
+
+
+def session_url(event_slug: str, session: dict) -> str:
+    session_uuid = session.get("uuid")
+    if session_uuid:
+        return f"https://warhorn.net/events/{event_slug}/schedule/sessions/{session_uuid}"
+    return f"https://warhorn.net/events/{event_slug}/schedule"
+
+
+def _session_block(event_slug: str, session: dict) -> str:
+    gm_name = session["gmSignups"][0]["user"]["name"] if session["gmSignups"] else "No GM"
+    available_seats = session["availablePlayerSeats"]
+
+    player_names = [format_player_name(signup["user"]["name"]) for signup in session["playerSignups"]]
+    players_list_str = ", ".join(player_names) if player_names else "No players signed up"
+
+    waitlist_names = signup_names(session.get("playerWaitlistEntries"))
+
+    if available_seats > 0:
+        status_line = f"* 🟢 **Status:** {available_seats} slots available!"
+    elif waitlist_names:
+        status_line = f"* 🟡 **Waitlist:** {', '.join(waitlist_names)}"
+    else:
+        status_line = "* 🟡 **Status:** Full (empty waitlist) "
+
+    unix_timestamp = int(parse_warhorn_dt(session["startsAt"]).timestamp())
+
+    session_block = f"**[{session['name']}]({session_url(event_slug, session)})**  \n"
+    session_block += f"* 📅 **When:** <t:{unix_timestamp}:F>  \n"
+    session_block += f"* 🧙‍ **GM:** ️ {gm_name}  \n"
+    session_block += f"* 👥 **Players:** {players_list_str}  \n"
+    session_block += f"{status_line}  \n\n"
+    return session_block
+
+
+def build_schedule_embed(sessions: list[dict], event_slug: str = "pandodnd") -> discord.Embed:
+    if not sessions:
+        return discord.Embed(title=SCHEDULE_TITLE, description="No upcoming sessions found.", color=discord.Color.blue())
+
+    desc_text = "The following games are upcoming on this server, click on a link to schedule a seat.\n\n"
+    desc_text += "".join(_session_block(event_slug, session) for session in sessions)
+    desc_text += ("*Join the waitlist to be next in line if there is a cancellation.*\n"
+                  "*If you are on a waitlist, you may still get a spot due to cancellations.*\n"
+                  "*Use `/wishlist browse` to see what others have requested, then `/wishlist add number:` to join one. "
+                  "Use `/wishlist add adventure:` for something new. "
+                  "When I schedule your wishlist adventure, I can sign you up in advance.*\n")
+    return discord.Embed(
+        title=SCHEDULE_TITLE,
+        description=desc_text,
+        color=discord.Color.blue(),
+        url=f"https://warhorn.net/events/{event_slug}/schedule"
+    )
+
+
+def with_as_of(embed: discord.Embed, fetched_at: datetime) -> discord.Embed:
+    """Copy of the schedule embed noting when its data was fetched.
+
+    Goes in the description rather than the footer because Discord only renders
+    <t:…> timestamps in message and description text.
+    """
+    stamped = embed.copy()
+    stamped.description = f"{stamped.description or ''}\n*As of <t:{int(fetched_at.timestamp())}:R>*"
+    return stamped
+
+
+def normalize_session(session: dict) -> dict:
+    """The fields of a Warhorn session that affect what we show or notify about."""
+    scenario = session.get("scenario") or {}
+    return {
+        "id": session.get("id"),
+        "uuid": session.get("uuid"),
+        "name": session.get("name"),
+        "startsAt": session.get("startsAt"),
+        "endsAt": session.get("endsAt"),
+        "maxPlayers": session.get("maxPlayers"),
+        "availablePlayerSeats": session.get("availablePlayerSeats"),
+        "gms": signup_names(session.get("gmSignups")),
+        "players": signup_names(session.get("playerSignups")),
+        "waitlist": signup_names(session.get("playerWaitlistEntries")),
+        "scenario": scenario.get("externalUrl"),
+    }
+
+
+def schedule_digest(sessions: list[dict], embed: discord.Embed | None = None) -> str:
+    """SHA-256 over the normalized sessions and, if given, the rendered embed.
+
+    Hashing the embed too means a change to how the schedule is rendered still
+    triggers an edit even when Warhorn's data is unchanged.
+    """
+    payload = {
+        "sessions": [normalize_session(session) for session in sessions],
+        "embed": embed.to_dict() if embed is not None else None,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
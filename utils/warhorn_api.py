@@ -1,14 +1,19 @@
 import json
 import os
+import aiohttp
 import requests
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
+from utils.http_session import PooledSession
 
 load_dotenv()
 
 WARHORN_APPLICATION_TOKEN = os.getenv("WARHORN_APPLICATION_TOKEN")
 WARHORN_API_ENDPOINT = "https://warhorn.net/graphql"
+WARHORN_CONNECT_TIMEOUT = 5
+WARHORN_READ_TIMEOUT = 20
+WARHORN_KEEPALIVE_SECONDS = 300
 EASTERN = ZoneInfo("America/New_York")
 OBS_TITLE_PREFIX = "PandoDnD plays: "
 
@@ -132,20 +137,44 @@ def format_obs_copy(session: dict) -> str:
         lines.append(external_url)
     return "\n".join(lines)
 
+def _request_headers(app_token) -> dict:
+    return {
+        "Authorization": f"Bearer {app_token}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+
+
+def _query_payload(query, variables=None) -> dict:
+    payload = {"query": query}
+    if variables:
+        payload["variables"] = variables
+    return payload
+
+
+def _event_sessions_variables(
+    event_slug,
+    starts_after: datetime | None = None,
+    starts_before: datetime | None = None,
+) -> dict:
+    variables = {"events": [event_slug]}
+    if starts_after is not None:
+        variables["startsAfter"] = starts_after.isoformat()
+    else:
+        variables["startsAfter"] = datetime.now(timezone.utc).isoformat()
+    if starts_before is not None:
+        variables["startsBefore"] = starts_before.isoformat()
+    return variables
+
+
 class WarhornClient:
     def __init__(self, api_endpoint, app_token):
         self.api_endpoint = api_endpoint
         self.app_token = app_token
 
     def run_query(self, query, variables=None):
-        headers = {
-            "Authorization": f"Bearer {self.app_token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-        payload = {"query": query}
-        if variables:
-            payload["variables"] = variables
+        headers = _request_headers(self.app_token)
+        payload = _query_payload(query, variables)
 
         response = requests.post(self.api_endpoint, headers=headers, data=json.dumps(payload))
         print(f"Warhorn API response status: {response.status_code}")
@@ -164,22 +193,74 @@ class WarhornClient:
         starts_after: datetime | None = None,
         starts_before: datetime | None = None,
     ):
-        variables = {"events": [event_slug]}
-        if starts_after is not None:
-            variables["startsAfter"] = starts_after.isoformat()
-        else:
-            variables["startsAfter"] = datetime.now(timezone.utc).isoformat()
-        if starts_before is not None:
-            variables["startsBefore"] = starts_before.isoformat()
         return self.run_query(
             event_sessions_query,
-            variables=variables,
+            variables=_event_sessions_variables(event_slug, starts_after, starts_before),
         )
 
     def get_sessions_for_gotime(self, event_slug, now: datetime | None = None):
         now = now or datetime.now(timezone.utc)
         return self.get_event_sessions(event_slug, starts_after=start_of_today_eastern(now))
 
+
+class AsyncWarhornClient:
+    """Non-blocking WarhornClient for use inside the bot's event loop.
+
+    Holds one aiohttp session for its lifetime so HTTPS connections to Warhorn are
+    pooled and kept alive between polls. The bot owns the client and closes it on
+    shutdown (P4ND0Bot.close, through WarhornSnapshotService.close).
+    """
+
+    def __init__(
+        self,
+        api_endpoint,
+        app_token,
+        *,
+        connect_timeout: float = WARHORN_CONNECT_TIMEOUT,
+        read_timeout: float = WARHORN_READ_TIMEOUT,
+        max_connections: int = 4,
+    ):
+        self.api_endpoint = api_endpoint
+        self.app_token = app_token
+        self._session = PooledSession(
+            headers=_request_headers(app_token),
+            timeout=aiohttp.ClientTimeout(total=None, connect=connect_timeout, sock_read=read_timeout),
+            max_connections=max_connections,
+            keepalive_timeout=WARHORN_KEEPALIVE_SECONDS,
+        )
+
+    async def close(self):
+        await self._session.close()
+
+    async def run_query(self, query, variables=None):
+        session = self._session.get()
+        async with session.post(self.api_endpoint, json=_query_payload(query, variables)) as response:
+            text = await response.text()
+            print(f"Warhorn API response status: {response.status}")
+            print(f"Warhorn API raw response: {text}")
+            response.raise_for_status()
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            print(f"JSON decoding error: {e}")
+            print(f"Response content: {text}")
+            raise
+
+    async def get_event_sessions(
+        self,
+        event_slug,
+        starts_after: datetime | None = None,
+        starts_before: datetime | None = None,
+    ):
+        return await self.run_query(
+            event_sessions_query,
+            variables=_event_sessions_variables(event_slug, starts_after, starts_before),
+        )
+
+    async def get_sessions_for_gotime(self, event_slug, now: datetime | None = None):
+        now = now or datetime.now(timezone.utc)
+        return await self.get_event_sessions(event_slug, starts_after=start_of_today_eastern(now))
+
 if __name__ == "__main__":
     client = WarhornClient(WARHORN_API_ENDPOINT, WARHORN_APPLICATION_TOKEN)
     pandodnd_slug = "pandodnd"
@@ -0,0 +1,87 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from utils import async_db
+from utils.warhorn_api import AsyncWarhornClient, parse_warhorn_dt
+
+SNAPSHOT_TTL = timedelta(minutes=5)
+
+
+@dataclass(frozen=True)
+class WarhornSnapshot:
+    """Every session for the event from the start of today (Eastern), sorted by start time."""
+
+    nodes: list
+    fetched_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def age(self, now: datetime | None = None) -> timedelta:
+        now = now or datetime.now(timezone.utc)
+        return now - self.fetched_at
+
+    def upcoming(self, now: datetime | None = None) -> list:
+        """Sessions that haven't started yet, which is what /schedule and /watch show."""
+        now = now or datetime.now(timezone.utc)
+        return [s for s in self.nodes if parse_warhorn_dt(s["startsAt"]) > now]
+
+
+def _nodes_from_result(result: dict) -> list:
+    try:
+        nodes = result["data"]["eventSessions"]["nodes"]
+    except (KeyError, TypeError):
+        raise ValueError("Unexpected Warhorn API response structure") from None
+    return sorted(nodes, key=lambda s: parse_warhorn_dt(s["startsAt"]))
+
+
+class WarhornSnapshotService:
+    """One cached eventSessions view of a Warhorn event, shared by every cog.
+
+    get() answers from memory while the last snapshot is younger than the TTL.
+    Otherwise it fetches, and concurrent callers share the single in-flight request
+    instead of each hitting Warhorn.
+    """
+
+    def __init__(self, client: AsyncWarhornClient, event_slug: str, *, ttl: timedelta = SNAPSHOT_TTL):
+        self.client = client
+        self.event_slug = event_slug
+        self.ttl = ttl
+        self.latest: WarhornSnapshot | None = None
+        self._inflight: asyncio.Task | None = None
+        self.stats = {"hits": 0, "fetches": 0, "coalesced": 0, "errors": 0}
+
+    async def get(self, max_age: timedelta | None = None) -> WarhornSnapshot:
+        max_age = self.ttl if max_age is None else max_age
+        if self.latest is not None and self.latest.age() <= max_age:
+            self.stats["hits"] += 1
+            return self.latest
+        return await self.refresh()
+
+    async def refresh(self) -> WarhornSnapshot:
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._fetch())
+            self._inflight.add_done_callback(self._clear_inflight)
+        else:
+            self.stats["coalesced"] += 1
+        # shield() so one caller being cancelled doesn't cancel the fetch for the others.
+        return await asyncio.shield(self._inflight)
+
+    def _clear_inflight(self, task: asyncio.Task):
+        self._inflight = None
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+
+    async def _fetch(self) -> WarhornSnapshot:
+        self.stats["fetches"] += 1
+        now = datetime.now(timezone.utc)
+        result = await self.client.get_sessions_for_gotime(self.event_slug, now=now)
+        snapshot = WarhornSnapshot(_nodes_from_result(result), fetched_at=now)
+        self.latest = snapshot
+
+        try:
+            await async_db.record_warhorn_sessions(snapshot.nodes)
+        except Exception as e:
+            print(f"[Warhorn] Failed to record sessions from snapshot: {e}")
+        return snapshot
+
+    async def close(self):
+        await self.client.close()